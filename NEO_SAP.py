@@ -1,6 +1,8 @@
-import win32com.client
 import time
 import sys
+import threading
+import queue
+from concurrent.futures import Future
 from config import 회사코드, 결산월, 파일저장경로
 
 class SAPAutomation:
@@ -16,7 +18,8 @@ class SAPAutomation:
     def connect_to_sap(self):
         """SAP GUI에 연결 (다중 세션 지원)"""
         try:
-            # SAP GUI 연결
+            # SAP GUI 연결 (pywin32는 연결할 때만 필요 → 나머지 모듈은 Windows 밖에서도 임포트 가능)
+            import win32com.client
             sapgui = win32com.client.GetObject("SAPGUI")
             application = sapgui.GetScriptingEngine
             connection = application.Children(self.connection_index)
@@ -124,15 +127,16 @@ class SAPAutomation:
         except Exception as e:
             print(f"새로고침 실패: {e}")
     
-    def export_to_excel(self):
+    def export_to_excel(self, file_path=None):
         """조회 결과를 Excel로 내보내기"""
         try:
             # Ctrl+Shift+F9 (Excel 내보내기)
             self.session.findById("wnd[0]").sendVKey(9, "ctrl+shift")
             time.sleep(1)
             
-            # 파일 경로 지정 (config에서 가져옴)
-            file_path = f"{self.파일저장경로}sap_export_{self.결산월}.xlsx"
+            # 파일 경로 지정 (기본값은 config에서 가져옴)
+            if file_path is None:
+                file_path = f"{self.파일저장경로}sap_export_{self.결산월}.xlsx"
             self.find("wnd[1]/usr/ctrlSSLN_EXPORT/txtDY_PATH").text = file_path
             self.find("wnd[1]/tbar[0]/btn[11]").press()  # 확인
             
@@ -141,6 +145,67 @@ class SAPAutomation:
         except Exception as e:
             print(f"Excel 내보내기 실패: {e}")
 
+class SAPSessionPool:
+    """SAP 세션 풀 (세션마다 전용 스레드가 연결을 유지)
+
+    COM 객체는 만든 스레드에서만 사용해야 하므로, 각 세션은 자기 스레드에서
+    연결하고 작업도 그 스레드에서 실행합니다. submit(fn)은 fn(sap)을 비어 있는
+    세션에서 실행하고 Future를 반환합니다.
+    """
+
+    def __init__(self, size=1, connection_index=0):
+        self.size = size
+        self.connection_index = connection_index
+        self._jobs = queue.Queue()
+        self._threads = []
+
+        # COM 초기화 모듈은 풀을 만들 때 확인 (없으면 세션 스레드가 아니라 호출한 곳에서 ImportError)
+        import pythoncom
+        self._pythoncom = pythoncom
+        
+        for i in range(size):
+            thread = threading.Thread(target=self._worker, args=(i,), name=f"sap-session-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def _worker(self, session_index):
+        self._pythoncom.CoInitialize()
+        sap = None
+        
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                
+                future, fn, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                
+                try:
+                    # 연결은 첫 작업 때 한 번만 (이후 재사용)
+                    if sap is None:
+                        sap = SAPAutomation(self.connection_index, session_index)
+                    future.set_result(fn(sap, *args, **kwargs))
+                except BaseException as e:
+                    # connect_to_sap의 sys.exit도 작업 실패로 처리
+                    future.set_exception(e if isinstance(e, Exception) else RuntimeError(f"SAP 연결 실패: {e}"))
+        finally:
+            self._pythoncom.CoUninitialize()
+    
+    def submit(self, fn, *args, **kwargs):
+        """fn(sap, *args, **kwargs)를 세션 스레드에서 실행"""
+        future = Future()
+        self._jobs.put((future, fn, args, kwargs))
+        return future
+    
+    def shutdown(self):
+        """세션 스레드 종료"""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
 # 사용 예시
 if __name__ == "__main__":
 
@@ -2,4 +2,47 @@
 
 결산월 = "2025.05"
 
-파일저장경로 ="C:"
\ No newline at end of file
+파일저장경로 ="C:"
+
+결과저장소경로 = "data/temp/result_store.sqlite"
+
+# 매출 분석 대용량 모드 (정제된 시트를 디스크에 두고 집계값만 메모리에 보관)
+매출분석_대용량모드 = False
+
+# 입력 폴더 감시 주기 (초, python main.py watch)
+감시주기 = 0.5
+
+# 재무제표 검증 (허용오차: 원, 변동임계치: 직전 기간 대비 변동률)
+검증_허용오차 = 1
+검증_변동임계치 = 0.5
+
+# 상주 서비스 (python main.py serve)
+서비스포트 = 8765
+서비스_동시작업수 = 4
+SAP세션수 = 1
+
+# 계정 매핑 파일 (계정번호 범위 + 키워드, 수정하면 다음 실행부터 반영)
+계정매핑파일 = "data/mapping/chart_of_accounts.json"
+
+# 연결 (연결 재무제표 회사코드, 보고통화, 내부거래 대사 허용오차: 원)
+연결_회사코드 = "CONSOL"
+연결_보고통화 = "KRW"
+연결_내부거래허용오차 = 1000
+
+# SAP 내보내기 레이아웃 등록부 (처음 보는 시산표 형식은 자동 판별 후 등록)
+레이아웃등록파일 = "data/mapping/export_layouts.json"
+
+# 재무제표 누적 통합문서 (회사별 1개 파일에 결산월 열 추가, 보관 개월 수)
+재무제표_누적내보내기 = False
+누적보관개월 = 24
+
+# SAP 트랜잭션 스크립트 폴더 (JSON, 새 리포트는 스크립트 파일만 추가)
+SAP스크립트폴더 = "data/scripts"
+
+# 월 마감 스케줄러 (python main.py close 회사코드[,..] 결산월[,..])
+마감_SAP동시실행 = 1
+마감_CPU동시실행 = 4
+마감_IO동시실행 = 2
+마감_SAP재시도 = 3
+마감_재시도대기 = 5
+마감_매출폴더 = None  # 예: "data/input/{company}/" (None이면 매출 대시보드 단계 생략)
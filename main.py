@@ -7,6 +7,7 @@ from datetime import datetime
 # 모듈 임포트
 from modules.sales_analyzer import SalesAnalyzer
 from modules.financial_statements import FinancialStatements
+from modules.result_store import ResultStore
 
 def create_directories():
     """필요한 디렉토리 생성"""
@@ -46,8 +47,10 @@ def run_sales_analyzer():
     print("\n🚀 매출/비용 분석기 시작!")
     print("-" * 40)
     
+    from config import 매출분석_대용량모드
+    
     try:
-        analyzer = SalesAnalyzer()
+        analyzer = SalesAnalyzer(out_of_core=매출분석_대용량모드)
         
         # 단계별 실행
         print("1️⃣ Excel 파일 수집 중...")
@@ -67,6 +70,10 @@ def run_sales_analyzer():
     except Exception as e:
         print(f"❌ 매출 분석 실패: {e}")
         return False
+    
+    finally:
+        if 'analyzer' in locals() and analyzer.spill_store is not None:
+            analyzer.spill_store.cleanup()
 
 def run_financial_statements():
     """재무제표 생성기 실행"""
@@ -74,7 +81,8 @@ def run_financial_statements():
     print("-" * 40)
     
     try:
-        fs = FinancialStatements()
+        store = ResultStore()
+        fs = FinancialStatements(store=store)
         
         print("1️⃣ SAP 시산표 추출 중...")
         fs.load_trial_balance()
@@ -82,12 +90,20 @@ def run_financial_statements():
         print("2️⃣ 재무제표 생성 중...")
         fs.generate_statements()
         
-        print("3️⃣ 재무비율 계산 중...")
+        print("3️⃣ 재무제표 검증 중...")
+        fs.validate()
+        
+        print("4️⃣ 재무비율 계산 중...")
         fs.calculate_financial_ratios()
         
-        print("4️⃣ Excel 파일 생성 중...")
-        fs.export_to_excel()
+        print("5️⃣ Excel 파일 생성 중...")
+        from config import 재무제표_누적내보내기
+        if 재무제표_누적내보내기:
+            fs.export_incremental()
+        else:
+            fs.export_to_excel()
         
+        store.report()
         print("✅ 재무제표 생성 완료!")
         return True
         
@@ -169,10 +185,59 @@ def check_settings():
     except Exception as e:
         print(f"   ❌ 연결 오류: {e}")
 
+def clear_result_cache(company=None, period=None):
+    """재무제표 결과 캐시 무효화"""
+    ResultStore().invalidate(company, period)
+
+def run_month_end_close(params):
+    """월 마감 스케줄러 실행 (여러 회사/결산월, 중단 시 --resume으로 재개)"""
+    from modules.close_scheduler import CloseScheduler
+    from config import 마감_매출폴더, 재무제표_누적내보내기
+    
+    try:
+        if len(params) == 2 and params[0] == '--resume':
+            scheduler = CloseScheduler(run_id=params[1])
+        elif len(params) >= 2:
+            scheduler = CloseScheduler(params[0].split(','), params[1].split(','),
+                                       sales_folder=마감_매출폴더, incremental=재무제표_누적내보내기)
+        else:
+            print("사용법: python main.py close 회사코드[,..] 결산월[,..] | close --resume 실행ID")
+            return None
+    except ValueError as e:
+        # 없는 실행 ID로 재개, 회사코드/결산월 누락 등
+        print(f"❌ 월 마감 시작 실패: {e}")
+        return None
+    
+    return scheduler.run()
+
+def run_command(args):
+    """명령행 인자 실행 (예: python main.py cache-clear h182 2025.05)"""
+    command, params = args[0], args[1:]
+    
+    if command == 'cache-clear':
+        clear_result_cache(*params[:2])
+    elif command == 'serve':
+        from modules.service import serve
+        serve(int(params[0]) if params else None)
+    elif command == 'close':
+        run_month_end_close(params)
+    elif command == 'watch':
+        from modules.input_watcher import InputWatcher
+        InputWatcher(params[0] if params else "data/input/").run()
+    else:
+        print(f"❌ 알 수 없는 명령: {command}")
+        print("사용법: python main.py [cache-clear [회사코드] [결산월] | serve [포트] | "
+              "close 회사코드[,..] 결산월[,..] | close --resume 실행ID | watch [입력폴더]]")
+
 def main():
     """메인 함수"""
     # 초기 설정
     create_directories()
+    
+    if len(sys.argv) > 1:
+        run_command(sys.argv[1:])
+        return
+    
     print_banner()
     
     while True:
@@ -8,15 +8,34 @@
 모듈:
 - sales_analyzer: 매출/비용 분석 및 트렌드 분석
 - financial_statements: 재무제표 자동 생성 및 전년 비교
+- result_store: 재무제표 결과 캐시 (SQLite)
+- columnar_store: 매출 데이터 디스크 저장소 (대용량 모드)
+- validation: 시산표/재무제표 검증 (컴플라이언스 체크)
+- service: 상주 작업 서비스 (localhost HTTP API)
+- account_mapping: 계정 매핑 (계정번호 범위 + 키워드)
+- rolling_workbook: 결산월 누적 재무제표 통합문서
+- sap_script: 선언형 SAP 트랜잭션 스크립트 컴파일/재생
+- close_scheduler: 회사/결산월별 월 마감 단계 스케줄러
+- input_watcher: 입력 폴더 감시 + 매출 증분 재집계
+- consolidation: 연결 (외화환산, 내부거래 대사/제거)
+- layouts: SAP 내보내기 레이아웃 등록부 (필요한 컬럼만 타입 지정해 읽기)
 """
 
 from .sales_analyzer import SalesAnalyzer
 from .financial_statements import FinancialStatements
+from .result_store import ResultStore
+from .validation import TrialBalanceValidator, ValidationReport
+from .account_mapping import ChartOfAccounts, load_chart
 
 __version__ = "1.0.0"
 __author__ = "Financial Automation Team"
 
 __all__ = [
     'SalesAnalyzer',
-    'FinancialStatements'
+    'FinancialStatements',
+    'ResultStore',
+    'TrialBalanceValidator',
+    'ValidationReport',
+    'ChartOfAccounts',
+    'load_chart'
 ]
\ No newline at end of file
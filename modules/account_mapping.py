@@ -0,0 +1,202 @@
+# modules/account_mapping.py
+
+import hashlib
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append('..')
+from config import 계정매핑파일
+
+CLASS_COLUMNS = ['구분', '항목', '분류방법', '일치수', '모호', '일치항목']
+
+
+def match_keywords(names, rules):
+    """키워드 규칙 분류 (고유 계정명 기준, 가장 긴 키워드가 일치한 항목 선택)
+
+    names: 고유 계정명 Series
+    rules: [(구분, 항목, 키워드 목록), ...]
+    반환: (항목 인덱스(-1=미매핑), 일치 항목 수, 동점 여부, 일치 항목명(쉼표 구분))
+
+    키워드가 있는 규칙만 돌며 계정별 최장 길이/항목/동점/일치 수를 1차원 배열로 갱신합니다.
+    """
+    # 대소문자 무시: 계정명은 한 번만 대문자로 변환 (키워드마다 변환하지 않음)
+    names = names.str.upper()
+    n = len(names)
+    best_len = np.zeros(n, dtype=int)
+    line_idx = np.full(n, -1)
+    ambiguous = np.zeros(n, dtype=bool)
+    n_matches = np.zeros(n, dtype=int)
+    hits = []
+
+    for j, (_, _, keywords) in enumerate(rules):
+        if not keywords:
+            continue
+
+        # 규칙 안에서 가장 긴 일치 키워드 길이 (긴 키워드부터 확인)
+        rule_len = np.zeros(n, dtype=int)
+        for keyword in sorted(set(keywords), key=len, reverse=True):
+            hit = names.str.contains(keyword.upper(), regex=False, na=False).to_numpy()
+            rule_len[hit & (rule_len == 0)] = len(keyword)
+
+        matched = rule_len > 0
+        if not matched.any():
+            continue
+
+        n_matches += matched
+        better = rule_len > best_len
+        ambiguous[matched & (rule_len == best_len)] = True
+        ambiguous[better] = False
+        best_len[better] = rule_len[better]
+        line_idx[better] = j
+        hits.append((j, np.flatnonzero(matched)))
+
+    # 일치 항목명: 한 항목만 일치하면 그 항목, 여러 항목이면 일치 순서대로 연결
+    matched_names = np.full(n, '', dtype=object)
+    single = n_matches == 1
+    matched_names[single] = [rules[j][1] for j in line_idx[single]]
+
+    multi = {}
+    for j, rows in hits:
+        for row in rows[n_matches[rows] > 1]:
+            multi.setdefault(row, []).append(rules[j][1])
+    for row, lines in multi.items():
+        matched_names[row] = ', '.join(lines)
+
+    return line_idx, n_matches, ambiguous, matched_names
+
+
+class ChartOfAccounts:
+    """계정 매핑 (계정번호 범위 우선, 키워드 보조)
+
+    범위는 시작값 기준으로 정렬된 경계 배열로 컴파일되어
+    searchsorted 한 번으로 모든 계정을 분류합니다.
+    """
+
+    def __init__(self, version, lines):
+        if not lines:
+            raise ValueError("계정 매핑에 항목이 없습니다.")
+        self.version = version
+        self.lines = lines
+        self.rules = [(line['section'], line['line'], line.get('keywords', [])) for line in lines]
+        self._sections = np.array([line['section'] for line in lines], dtype=object)
+        self._names = np.array([line['line'] for line in lines], dtype=object)
+        self._compile_ranges()
+
+    @classmethod
+    def load(cls, path):
+        """JSON 매핑 파일 로드 (버전 = 파일의 version + 내용 해시)"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+        version = f"{data.get('version', '0')}:{hashlib.sha256(raw).hexdigest()[:8]}"
+        return cls(version, data['lines'])
+
+    def _compile_ranges(self):
+        ranges = [(float(lo), float(hi), idx)
+                  for idx, line in enumerate(self.lines)
+                  for lo, hi in line.get('ranges', [])]
+        ranges.sort()
+
+        for lo, hi, idx in ranges:
+            if lo > hi:
+                raise ValueError(f"잘못된 계정 범위: {self._names[idx]} {lo:.0f}-{hi:.0f}")
+
+        # 범위가 겹치면 한 계정이 여러 항목에 매핑되므로 컴파일 단계에서 거부
+        for (lo1, hi1, idx1), (lo2, hi2, idx2) in zip(ranges, ranges[1:]):
+            if lo2 <= hi1:
+                raise ValueError(f"계정 범위 중복: {self._names[idx1]} {lo1:.0f}-{hi1:.0f} / "
+                                 f"{self._names[idx2]} {lo2:.0f}-{hi2:.0f}")
+
+        self._starts = np.array([r[0] for r in ranges], dtype=float)
+        self._ends = np.array([r[1] for r in ranges], dtype=float)
+        self._range_lines = np.array([r[2] for r in ranges], dtype=int)
+
+    def classify_numbers(self, numbers):
+        """계정번호 → 항목 인덱스 (-1 = 범위 밖)"""
+        numbers = pd.to_numeric(pd.Series(numbers), errors='coerce').to_numpy(dtype=float)
+        if not len(self._starts):
+            return np.full(len(numbers), -1)
+
+        pos = np.searchsorted(self._starts, numbers, side='right') - 1
+        safe = np.clip(pos, 0, None)
+        inside = (pos >= 0) & (numbers <= self._ends[safe])
+
+        return np.where(inside, self._range_lines[safe], -1)
+
+    def classify(self, numbers, names):
+        """계정번호/계정명 → 분류 결과 DataFrame (CLASS_COLUMNS)
+
+        범위에 해당하는 계정은 범위로, 나머지는 키워드 규칙으로 분류합니다.
+        """
+        names = pd.Series(names).astype(str).reset_index(drop=True)
+        n = len(names)
+        line_idx = self.classify_numbers(numbers) if numbers is not None else np.full(n, -1)
+        method = np.where(line_idx >= 0, '범위', None).astype(object)
+        n_matches = (line_idx >= 0).astype(int)
+        ambiguous = np.zeros(n, dtype=bool)
+        matched_names = np.full(n, '', dtype=object)
+        matched_names[line_idx >= 0] = self._names[line_idx[line_idx >= 0]]
+
+        # 범위 밖 계정만 키워드로 분류 (고유 계정명 기준)
+        rest = line_idx < 0
+        if rest.any():
+            codes, uniques = pd.factorize(names[rest])
+            kw_idx, kw_count, kw_ambiguous, kw_names = match_keywords(pd.Series(uniques), self.rules)
+
+            line_idx[rest] = kw_idx[codes]
+            method[rest] = np.where(kw_idx[codes] >= 0, '키워드', None)
+            n_matches[rest] = kw_count[codes]
+            ambiguous[rest] = kw_ambiguous[codes]
+            matched_names[rest] = kw_names[codes]
+
+        mapped = line_idx >= 0
+        safe = np.clip(line_idx, 0, None)
+        return pd.DataFrame({
+            '구분': np.where(mapped, self._sections[safe], None),
+            '항목': np.where(mapped, self._names[safe], None),
+            '분류방법': method,
+            '일치수': n_matches,
+            '모호': ambiguous,
+            '일치항목': matched_names,
+        })
+
+    def classify_trial_balance(self, tb):
+        """시산표에 분류 컬럼 추가 (고유 (계정번호, 계정과목) 조합만 분류한 뒤 행으로 펼침)
+
+        계정번호 컬럼이 없으면 계정과목 앞자리 숫자를 사용합니다.
+        """
+        name_codes, names = pd.factorize(tb['계정과목'], use_na_sentinel=False)
+        names = pd.Index(names).astype(str)
+        n_names = max(len(names), 1)
+
+        if '계정번호' in tb.columns:
+            number_codes, numbers = pd.factorize(tb['계정번호'], use_na_sentinel=False)
+            codes, pairs = pd.factorize(number_codes.astype(np.int64) * n_names + name_codes)
+            unique_numbers = np.asarray(numbers, dtype=object)[pairs // n_names]
+            unique_names = names.to_numpy()[pairs % n_names]
+        else:
+            codes = name_codes
+            unique_names = names.to_numpy()
+            unique_numbers = pd.Series(unique_names).str.extract(r'^\s*(\d+)', expand=False).to_numpy()
+
+        classes = self.classify(unique_numbers, unique_names)
+        return tb.assign(**{col: classes[col].to_numpy()[codes] for col in CLASS_COLUMNS})
+
+
+_loaded = {}
+
+
+def load_chart(path=None):
+    """계정 매핑 로드 (파일이 바뀌지 않았으면 컴파일된 매핑 재사용)"""
+    path = os.path.abspath(path or 계정매핑파일)
+    mtime = os.path.getmtime(path)
+
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        chart = ChartOfAccounts.load(path)
+        _loaded[path] = (mtime, chart)
+        print(f"🗂️ 계정 매핑 로드: {path} (버전 {chart.version})")
+
+    return _loaded[path][1]
@@ -0,0 +1,393 @@
+# modules/close_scheduler.py
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+sys.path.append('..')
+from NEO_SAP import SAPSessionPool
+from config import 파일저장경로, 마감_SAP동시실행, 마감_CPU동시실행, 마감_IO동시실행, 마감_SAP재시도, 마감_재시도대기
+from modules.financial_statements import FinancialStatements
+from modules.sales_analyzer import SalesAnalyzer
+from modules.result_store import ResultStore
+from modules.validation import previous_period
+
+# 회사/결산월별 단계 (이름, 자원, 선행 단계)
+CLOSE_STAGES = [
+    ('extract', 'sap', []),
+    ('statements', 'cpu', ['extract']),
+    ('validate', 'cpu', ['statements']),
+    ('ratios', 'cpu', ['statements']),
+    ('export', 'io', ['validate', 'ratios']),
+]
+SALES_STAGE = ('sales', 'io', [])
+
+# 전기 대비 변동 검증은 같은 회사 직전 결산월의 재무제표를 읽으므로
+# 직전 결산월도 이번 실행에 있으면 그 statements가 끝난 뒤에 validate 실행 (실패해도 진행)
+PRIOR_PERIOD_STAGES = [('validate', 'statements')]
+
+RUN_DIR = "data/temp/close_runs"
+
+
+class TransientSAPError(RuntimeError):
+    """재시도할 SAP 오류"""
+
+
+class CloseContext:
+    """회사/결산월 하나의 마감 상태 (단계 간 공유)"""
+
+    def __init__(self, company, period, store):
+        self.company = company
+        self.period = period
+        self.fs = FinancialStatements(company, period, store=store)
+        self.outputs = {}
+        self.lock = threading.Lock()
+
+
+class CloseScheduler:
+    """월 마감 스케줄러 (회사 × 결산월 단계 DAG 병렬 실행)
+
+    - 자원별 동시 실행 한도: SAP(세션 풀), CPU, I/O
+    - SAP 단계는 지수 백오프로 재시도
+    - 단계 완료마다 체크포인트 저장 → resume 시 완료된 단계 생략
+    - 실행 보고서: 단계별 소요시간, 임계 경로
+    """
+
+    def __init__(self, companies=None, periods=None, run_id=None, sales_folder=None, incremental=False):
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.checkpoint_file = os.path.join(RUN_DIR, f"{self.run_id}.json")
+        self.state = self._load_checkpoint()
+        if 'options' not in self.state and not (companies or periods):
+            raise ValueError(f"체크포인트가 없습니다: {self.run_id} ({self.checkpoint_file})")
+
+        # 재개 시 회사/결산월/옵션은 체크포인트 값 사용
+        options = self.state.setdefault('options', {
+            'companies': list(companies or []),
+            'periods': list(periods or []),
+            'sales_folder': sales_folder,
+            'incremental': incremental,
+        })
+        self.companies = options['companies']
+        self.periods = options['periods']
+        self.sales_folder = options['sales_folder']
+        self.incremental = options['incremental']
+        if not self.companies or not self.periods:
+            raise ValueError("회사코드와 결산월을 지정해야 합니다.")
+
+        self.store = ResultStore()
+        self.contexts = {}
+        # 누적 통합문서는 회사별 파일 하나 → 같은 회사의 결산월 내보내기는 순서대로
+        self.workbook_locks = {company: threading.Lock() for company in self.companies}
+        self.graph = self._build_graph()
+
+    # ---------- DAG ----------
+
+    def _build_graph(self):
+        """노드: (회사코드, 결산월, 단계) → {'resource', 'deps', 'after'}
+
+        deps: 성공해야 실행되는 선행 단계
+        after: 끝나기만(성공/실패) 하면 되는 순서 제약 (직전 결산월 재무제표)
+        """
+        graph = {}
+        stages = list(CLOSE_STAGES) + ([SALES_STAGE] if self.sales_folder else [])
+
+        for company in self.companies:
+            for period in self.periods:
+                prior = previous_period(period)
+                for name, resource, deps in stages:
+                    graph[(company, period, name)] = {
+                        'resource': resource,
+                        'deps': [(company, period, dep) for dep in deps],
+                        'after': [(company, prior, dep) for stage, dep in PRIOR_PERIOD_STAGES
+                                  if stage == name and prior in self.periods],
+                    }
+        return graph
+
+    @staticmethod
+    def node_id(node):
+        return "/".join(node)
+
+    def _context(self, company, period):
+        key = (company, period)
+        if key not in self.contexts:
+            self.contexts[key] = CloseContext(company, period, self.store)
+        return self.contexts[key]
+
+    # ---------- 체크포인트 ----------
+
+    def _load_checkpoint(self):
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, encoding='utf-8') as f:
+                state = json.load(f)
+            done = sum(1 for s in state['stages'].values() if s['status'] == 'done')
+            print(f"♻️ 체크포인트에서 재개: {self.run_id} (완료된 단계 {done}개)")
+            return state
+        return {'run_id': self.run_id, 'stages': {}}
+
+    def _save_checkpoint(self):
+        os.makedirs(RUN_DIR, exist_ok=True)
+        tmp_file = self.checkpoint_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    # ---------- 단계 구현 ----------
+
+    def _ensure_statements(self, ctx):
+        """시산표 로드 + 재무제표 생성 (재개 시 캐시에서 빠르게 복원)"""
+        with ctx.lock:
+            if ctx.fs.trial_balance is None:
+                ctx.fs.load_trial_balance(ctx.outputs['extract'])
+                if ctx.fs.trial_balance is None:
+                    raise RuntimeError(f"시산표 로드 실패: {ctx.outputs['extract']}")
+            if not ctx.fs.statements:
+                ctx.fs.generate_statements()
+
+    def run_stage(self, node, sap=None):
+        company, period, name = node
+        ctx = self._context(company, period)
+
+        if name == 'extract':
+            file_path = ctx.fs.extract_trial_balance_from_sap(sap)
+            if file_path is None:
+                raise TransientSAPError(f"{company} {period} 시산표 추출 실패")
+            return file_path
+
+        if name == 'statements':
+            self._ensure_statements(ctx)
+            return None
+
+        if name == 'validate':
+            self._ensure_statements(ctx)
+            report = ctx.fs.validate()
+            return {'passed': report.passed} if report is not None else None
+
+        if name == 'ratios':
+            self._ensure_statements(ctx)
+            return ctx.fs.calculate_financial_ratios()
+
+        if name == 'export':
+            self._ensure_statements(ctx)
+            if not ctx.fs.ratios:
+                ctx.fs.calculate_financial_ratios()
+            # 재개 시 완료된 validate는 다시 실행되지 않으므로 검증결과 시트용으로 다시 검증
+            if ctx.fs.validation_report is None:
+                ctx.fs.validate()
+            if self.incremental:
+                with self.workbook_locks[company]:
+                    output = ctx.fs.export_incremental()
+            else:
+                output = ctx.fs.export_to_excel(f"{파일저장경로}재무제표_{company}_{period}.xlsx")
+            # 내보내기 함수는 오류를 출력하고 None 반환 → 실패로 기록해야 재개 시 다시 실행
+            if output is None:
+                raise RuntimeError(f"{company} {period} 재무제표 내보내기 실패")
+            return output
+
+        if name == 'sales':
+            folder = self.sales_folder.format(company=company, period=period)
+            analyzer = SalesAnalyzer(company=company, period=period)
+            analyzer.collect_excel_files(folder)
+            analyzer.analyze_trends()
+            return analyzer.generate_dashboard(f"data/output/sales_dashboard_{company}_{period}.html")
+
+        raise ValueError(f"알 수 없는 단계: {name}")
+
+    @staticmethod
+    def _timed(fn, *args):
+        """단계 실행 + 실제 시작/종료 시각 기록 (SAP 세션/스레드 풀 대기 시간 제외)"""
+        timing = {'started_at': datetime.now(), 'started': time.perf_counter()}
+        try:
+            output, attempts = fn(*args)
+            return output, attempts, timing
+        except Exception as e:
+            e.timing = timing
+            raise
+        finally:
+            timing['ended'] = time.perf_counter()
+
+    def _sap_with_retry(self, sap, node):
+        """SAP 단계 (일시 오류는 지수 백오프로 재시도)"""
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                return self.run_stage(node, sap), attempts
+            except TransientSAPError as e:
+                if attempts > 마감_SAP재시도:
+                    raise
+                delay = 마감_재시도대기 * (2 ** (attempts - 1))
+                print(f"🔁 {self.node_id(node)} 재시도 {attempts}/{마감_SAP재시도} ({delay:.0f}초 후): {e}")
+                time.sleep(delay)
+
+    def _run_sap_stage(self, sap, node):
+        return self._timed(self._sap_with_retry, sap, node)
+
+    def _run_local_stage(self, node):
+        return self._timed(lambda: (self.run_stage(node), 1))
+
+    # ---------- 실행 ----------
+
+    def run(self):
+        """DAG 실행 후 보고서 반환"""
+        print(f"🗓️ 월 마감 시작: 회사 {len(self.companies)}개 × 결산월 {len(self.periods)}개 "
+              f"({len(self.graph)}단계, 실행 ID {self.run_id})")
+
+        stages = self.state['stages']
+        done = {node for node in self.graph if stages.get(self.node_id(node), {}).get('status') == 'done'}
+        failed = set()
+        running = {}
+
+        # 재개 시 완료된 단계의 출력 복원
+        for node in done:
+            self._context(node[0], node[1]).outputs[node[2]] = stages[self.node_id(node)].get('output')
+
+        sap_pool = SAPSessionPool(size=마감_SAP동시실행)
+        executors = {
+            'cpu': ThreadPoolExecutor(max_workers=마감_CPU동시실행, thread_name_prefix="close-cpu"),
+            'io': ThreadPoolExecutor(max_workers=마감_IO동시실행, thread_name_prefix="close-io"),
+        }
+        run_started = time.perf_counter()
+
+        try:
+            while True:
+                # 선행 단계가 모두 끝난 단계 제출 (실행 중인 단계는 다시 제출하지 않음)
+                in_flight = {node for node, _ in running.values()}
+                for node, spec in self.graph.items():
+                    if node in done or node in failed or node in in_flight:
+                        continue
+                    if any(dep in failed for dep in spec['deps']):
+                        failed.add(node)
+                        stages[self.node_id(node)] = {'status': 'skipped', 'resource': spec['resource']}
+                        continue
+                    if all(dep in done for dep in spec['deps']) and \
+                            all(dep in done or dep in failed for dep in spec['after']):
+                        if spec['resource'] == 'sap':
+                            future = sap_pool.submit(self._run_sap_stage, node)
+                        else:
+                            future = executors[spec['resource']].submit(self._run_local_stage, node)
+                        running[future] = (node, time.perf_counter())
+
+                if not running:
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node, submitted = running.pop(future)
+                    try:
+                        output, attempts, timing = future.result()
+                        record = {'status': 'done', 'attempts': attempts, 'output': output}
+                        self._context(node[0], node[1]).outputs[node[2]] = output
+                        done.add(node)
+                    except Exception as e:
+                        # SAP 연결 실패 등 단계 시작 전 오류는 소요시간 0
+                        now = time.perf_counter()
+                        timing = getattr(e, 'timing', {'started_at': datetime.now(), 'started': now, 'ended': now})
+                        record = {'status': 'failed', 'error': str(e)}
+                        failed.add(node)
+                        print(f"❌ {self.node_id(node)} 실패: {e}")
+
+                    # 실행 시간과 자원 대기 시간 분리 (임계 경로는 실행 시간 기준)
+                    record.update(
+                        resource=self.graph[node]['resource'],
+                        started_at=timing['started_at'].isoformat(timespec='seconds'),
+                        queue_seconds=round(max(timing['started'] - submitted, 0.0), 3),
+                        seconds=round(timing['ended'] - timing['started'], 3),
+                    )
+
+                    stages[self.node_id(node)] = record
+                    self._save_checkpoint()
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            sap_pool.shutdown()
+
+        report = self.build_report(time.perf_counter() - run_started)
+        self._save_checkpoint()
+        return report
+
+    # ---------- 보고서 ----------
+
+    def critical_path(self):
+        """단계 소요시간 기준 가장 긴 경로"""
+        stages = self.state['stages']
+        finish = {}
+        previous = {}
+
+        def longest(node):
+            if node not in finish:
+                best_dep = max(self.graph[node]['deps'] + self.graph[node]['after'], key=longest, default=None)
+                start = finish[best_dep] if best_dep else 0.0
+                finish[node] = start + stages.get(self.node_id(node), {}).get('seconds', 0.0)
+                previous[node] = best_dep
+            return finish[node]
+
+        if not self.graph:
+            return [], 0.0
+
+        end = max(self.graph, key=longest)
+        path = []
+        node = end
+        while node is not None:
+            path.append(self.node_id(node))
+            node = previous[node]
+
+        return list(reversed(path)), round(finish[end], 3)
+
+    def build_report(self, wall_seconds):
+        stages = self.state['stages']
+        path, path_seconds = self.critical_path()
+        counts = {}
+        queue_seconds = {}
+        for record in stages.values():
+            counts[record['status']] = counts.get(record['status'], 0) + 1
+            if 'queue_seconds' in record:
+                queue_seconds[record['resource']] = round(
+                    queue_seconds.get(record['resource'], 0.0) + record['queue_seconds'], 3)
+
+        report = {
+            'run_id': self.run_id,
+            'companies': self.companies,
+            'periods': self.periods,
+            'wall_seconds': round(wall_seconds, 3),
+            'status_counts': counts,
+            'critical_path': path,
+            'critical_path_seconds': path_seconds,
+            'queue_seconds': queue_seconds,
+            'stages': stages,
+        }
+
+        report_file = f"data/output/close_report_{self.run_id}.json"
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+        print("\n" + "=" * 50)
+        print(f"📊 월 마감 결과 ({self.run_id}): 전체 {report['wall_seconds']}초")
+        print("=" * 50)
+        for status, count in counts.items():
+            print(f"   - {status}: {count}단계")
+        print(f"🛤️ 임계 경로 ({path_seconds}초): {' → '.join(path)}")
+        for resource, seconds in queue_seconds.items():
+            print(f"⏳ {resource} 대기 합계: {seconds}초")
+        print(f"📁 보고서: {report_file}")
+
+        return report
+
+# CLI 실행 지원
+if __name__ == "__main__":
+    # 사용법: python -m modules.close_scheduler h182,h183 2025.04,2025.05
+    #         python -m modules.close_scheduler --resume 실행ID
+    args = sys.argv[1:]
+
+    try:
+        if len(args) == 2 and args[0] == '--resume':
+            CloseScheduler(run_id=args[1]).run()
+        elif len(args) >= 2:
+            CloseScheduler(args[0].split(','), args[1].split(',')).run()
+        else:
+            print("사용법: python -m modules.close_scheduler 회사코드[,..] 결산월[,..] | --resume 실행ID")
+    except ValueError as e:
+        print(f"❌ 월 마감 시작 실패: {e}")
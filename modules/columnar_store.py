@@ -0,0 +1,83 @@
+# modules/columnar_store.py
+
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+class SheetHandle:
+    """디스크에 저장된 시트 핸들 (메타데이터 + 사전 집계값만 메모리에 보관)"""
+
+    def __init__(self, path, columns, dtypes, n_rows, aggregates=None):
+        self.path = path
+        self.columns = columns
+        self.dtypes = dtypes
+        self.n_rows = n_rows
+        self.aggregates = aggregates or {}
+
+    def __len__(self):
+        return self.n_rows
+
+    def __repr__(self):
+        return f"SheetHandle({self.path}, rows={self.n_rows}, cols={len(self.columns)})"
+
+    def read(self, columns=None):
+        """필요한 컬럼만 디스크에서 읽어 DataFrame으로 반환"""
+        if columns is None:
+            columns = self.columns
+
+        data = {}
+        for col in columns:
+            idx = self.columns.index(col)
+            file_path = os.path.join(self.path, f"c{idx}.npy")
+            if self.dtypes[idx] == 'object':
+                data[col] = np.load(file_path, allow_pickle=True)
+            else:
+                # 숫자/날짜 컬럼은 메모리 매핑으로 필요할 때만 읽음
+                data[col] = np.load(file_path, mmap_mode='r')
+
+        return pd.DataFrame(data, columns=list(columns))
+
+
+class ColumnarStore:
+    """정제된 시트를 컬럼 단위 .npy 파일로 내려쓰는 저장소"""
+
+    def __init__(self, base_dir="data/temp/sales_spill"):
+        os.makedirs(base_dir, exist_ok=True)
+        self.root = tempfile.mkdtemp(prefix="run_", dir=base_dir)
+        self._count = 0
+
+    def spill(self, df, aggregates=None):
+        """DataFrame을 디스크에 쓰고 핸들 반환"""
+        path = os.path.join(self.root, str(self._count))
+        os.makedirs(path)
+        self._count += 1
+
+        columns = [str(col) for col in df.columns]
+        dtypes = []
+
+        for idx, col in enumerate(df.columns):
+            values = df[col].to_numpy()
+            if values.dtype == object:
+                np.save(os.path.join(path, f"c{idx}.npy"), values, allow_pickle=True)
+                dtypes.append('object')
+            else:
+                np.save(os.path.join(path, f"c{idx}.npy"), values)
+                dtypes.append(str(values.dtype))
+
+        meta = {'columns': columns, 'dtypes': dtypes, 'n_rows': len(df), 'aggregates': aggregates or {}}
+        with open(os.path.join(path, "meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=float)
+
+        return SheetHandle(path, columns, dtypes, len(df), meta['aggregates'])
+
+    def discard(self, handle):
+        """시트 하나 삭제 (입력 파일이 바뀌거나 삭제된 경우)"""
+        shutil.rmtree(handle.path, ignore_errors=True)
+
+    def cleanup(self):
+        """저장소 삭제"""
+        shutil.rmtree(self.root, ignore_errors=True)
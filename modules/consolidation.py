@@ -0,0 +1,326 @@
+# modules/consolidation.py
+
+import os
+import re
+import sys
+import time
+from datetime import date
+import numpy as np
+import pandas as pd
+sys.path.append('..')
+from config import 연결_회사코드, 연결_보고통화, 연결_내부거래허용오차
+from modules.account_mapping import load_chart
+from modules.financial_statements import FinancialStatements
+from modules.result_store import hash_trial_balance
+
+# 환산 환율 (항목 구분 → 환율 컬럼), 자본은 역사적환율이 없으면 기말환율 사용
+RATE_BY_SECTION = {'자산': '기말환율', '부채': '기말환율', '자본': '역사적환율', '수익': '평균환율', '비용': '평균환율'}
+
+# 내부거래 대사 쌍 (유형, 채권/수익 측 항목, 채무/비용 측 항목)
+IC_PAIRS = [
+    ('채권채무', ['매출채권'], ['매입채무', '미지급금']),
+    ('수익비용', ['매출액', '기타수익'], ['매출원가', '임차료', '기타판관비', '금융비용']),
+]
+
+# 연결 조정 계정
+CTA_ACCOUNT = '해외사업환산손익'
+IC_DIFFERENCE_ACCOUNT = '내부거래차이'
+
+TB_COLUMNS = ['회사코드', '결산월', '계정과목', '차변', '대변', '통화', '거래상대']
+MATCH_COLUMNS = ['결산월', '유형', '회사코드', '거래상대', '채권측금액', '채무측금액', '차이', '상태']
+ENTRY_COLUMNS = ['결산월', '조정유형', '회사코드', '거래상대', '계정과목', '항목', '금액']
+
+
+
+def normalize_period(value):
+    """결산월 값 → 'YYYY.MM' (Excel 숫자 2025.1 → '2025.10', 202505 → '2025.05', 날짜 → 연.월)"""
+    if isinstance(value, date):
+        return value.strftime('%Y.%m')
+
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        if value >= 100000:
+            year, month = divmod(int(value), 100)
+        else:
+            # 숫자 셀은 끝자리 0이 빠지므로 소수 둘째 자리까지 복원
+            year, month = map(int, f"{value:.2f}".split('.'))
+    else:
+        match = re.match(r'^\s*(\d{4})\D?(\d{1,2})\b', str(value))
+        if not match:
+            raise ValueError(f"결산월 형식 오류: {value!r}")
+        year, month = int(match.group(1)), int(match.group(2))
+
+    if not 1 <= month <= 12:
+        raise ValueError(f"결산월 형식 오류: {value!r}")
+    return f"{year}.{month:02d}"
+
+
+def map_unique(values, fn):
+    """컬럼 값 변환 (고유값만 fn으로 변환해 행으로 펼침)"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.array([fn(v) for v in uniques], dtype=object)
+    return pd.Series(mapped[codes], index=values.index)
+
+
+def normalize_periods(values):
+    """결산월 컬럼 정규화"""
+    return map_unique(values, normalize_period)
+
+
+def _partner(value):
+    """거래상대 정리 (빈 값/공백 → None)"""
+    if value is None or value != value or not str(value).strip():
+        return None
+    return value
+
+
+class ConsolidationResult:
+    """연결 결과 (연결 시산표 + 환산/대사/제거 감사 추적)"""
+
+    def __init__(self, trial_balance, translated, matches, entries, seconds):
+        self.trial_balance = trial_balance
+        self.translated = translated
+        self.matches = matches
+        self.entries = entries
+        self.seconds = seconds
+
+    def period_trial_balance(self, period):
+        """결산월 하나의 연결 시산표 [계정과목, 차변, 대변]"""
+        tb = self.trial_balance[self.trial_balance['결산월'] == normalize_period(period)]
+        return tb[['계정과목', '차변', '대변']].reset_index(drop=True)
+
+    def to_financial_statements(self, period, store=None, chart=None):
+        """연결 시산표를 기존 재무제표 생성기에 연결 (회사코드 = 연결_회사코드)"""
+        period = normalize_period(period)
+        fs = FinancialStatements(연결_회사코드, period, store=store, chart=chart)
+        fs.trial_balance = self.period_trial_balance(period)
+        if store is not None:
+            fs.cache_key = (fs.company, period, hash_trial_balance(fs.trial_balance), fs.chart.version)
+        return fs
+
+    def summary(self):
+        """조정유형별 건수/금액 합계"""
+        if self.entries.empty:
+            return pd.DataFrame(columns=['결산월', '조정유형', '건수', '금액'])
+        return (self.entries.groupby(['결산월', '조정유형'])['금액']
+                .agg(건수='size', 금액='sum').reset_index())
+
+    def print_summary(self):
+        print(f"🌐 연결 완료: 법인 {self.translated['회사코드'].nunique()}개, "
+              f"시산표 {len(self.translated):,}행, {self.seconds:.2f}초")
+        for _, row in self.summary().iterrows():
+            print(f"   - {row['결산월']} {row['조정유형']}: {row['건수']:,}건 ({row['금액']:,.0f})")
+
+        mismatched = self.matches[self.matches['상태'] == '차이']
+        if not mismatched.empty:
+            print(f"⚠️ 내부거래 불일치: {len(mismatched)}쌍 (허용오차 초과, '{IC_DIFFERENCE_ACCOUNT}' 계정으로 조정)")
+
+    def export_to_excel(self, output_file):
+        """연결 시산표 + 감사 추적 시트 내보내기"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+                self.trial_balance.to_excel(writer, sheet_name='연결시산표', index=False)
+                self.matches.to_excel(writer, sheet_name='내부거래대사', index=False)
+                self.entries.to_excel(writer, sheet_name='연결조정분개', index=False)
+            print(f"✅ 연결 Excel 내보내기 완료: {output_file}")
+            return output_file
+        except Exception as e:
+            print(f"❌ 연결 Excel 내보내기 실패: {e}")
+
+
+class Consolidator:
+    """연결 엔진 (법인별 시산표를 쌓은 DataFrame을 한 번에 처리)
+
+    tb: [회사코드, 결산월, 계정과목, 차변, 대변, 통화, 거래상대(내부거래 상대 법인, 없으면 빈 값)]
+    rates: [통화, 결산월, 기말환율, 평균환율, (역사적환율)] (1 현지통화 = 환율 × 보고통화)
+    """
+
+    def __init__(self, chart=None, reporting_currency=None, tolerance=None):
+        self.chart = chart or load_chart()
+        self.reporting_currency = reporting_currency or 연결_보고통화
+        self.tolerance = 연결_내부거래허용오차 if tolerance is None else tolerance
+
+    def consolidate(self, tb, rates):
+        """환산 → 내부거래 대사 → 제거 → 연결 시산표"""
+        started = time.perf_counter()
+
+        translated = self.translate(tb, rates)
+        ic = self.intercompany_lines(translated)
+        matches = self.match_intercompany(ic)
+        entries = pd.concat([
+            self.cta_entries(translated),
+            self.elimination_entries(ic),
+            self.difference_entries(matches),
+        ], ignore_index=True)[ENTRY_COLUMNS]
+
+        result = ConsolidationResult(self.build_trial_balance(translated, entries),
+                                     translated, matches, entries, time.perf_counter() - started)
+        result.print_summary()
+        return result
+
+    def translate(self, tb, rates):
+        """환율 테이블 조인으로 보고통화 환산 (구분별 기말/평균/역사적 환율)"""
+        missing = [col for col in TB_COLUMNS if col not in tb.columns and col != '거래상대']
+        if missing:
+            raise ValueError(f"연결 시산표 컬럼 누락: {missing}")
+
+        # 문자열 정리는 고유값만 처리 (행 수와 무관)
+        tb = tb[tb['계정과목'].notna()].copy()
+        tb['계정과목'] = map_unique(tb['계정과목'], str)
+        tb['결산월'] = normalize_periods(tb['결산월'])
+        tb['잔액'] = tb['차변'].astype(float) - tb['대변'].astype(float)
+        tb['거래상대'] = map_unique(tb['거래상대'], _partner) if '거래상대' in tb.columns else None
+
+        # 계정 분류 (고유 (계정번호, 계정과목) 조합만 분류)
+        tb = self.chart.classify_trial_balance(tb)
+
+        rates = rates.copy()
+        rates['결산월'] = normalize_periods(rates['결산월'])
+        if '역사적환율' not in rates.columns:
+            rates['역사적환율'] = rates['기말환율']
+        rates['역사적환율'] = rates['역사적환율'].fillna(rates['기말환율'])
+
+        # 보고통화는 환율 1
+        periods = tb['결산월'].unique()
+        own = pd.DataFrame({'통화': self.reporting_currency, '결산월': periods,
+                            '기말환율': 1.0, '평균환율': 1.0, '역사적환율': 1.0})
+        rates = pd.concat([rates[rates['통화'] != self.reporting_currency], own], ignore_index=True)
+
+        # 환율 테이블 조인: 고유 (통화, 결산월) 키에만 조인한 뒤 코드로 행에 펼침
+        currency_codes, currencies = pd.factorize(tb['통화'], use_na_sentinel=False)
+        period_codes, period_values = pd.factorize(tb['결산월'], use_na_sentinel=False)
+        n_periods = max(len(period_values), 1)
+        codes, pairs = pd.factorize(currency_codes.astype(np.int64) * n_periods + period_codes)
+
+        keys = pd.DataFrame({
+            '통화': np.asarray(currencies, dtype=object)[pairs // n_periods],
+            '결산월': np.asarray(period_values, dtype=object)[pairs % n_periods],
+        })
+        keys = keys.merge(rates[['통화', '결산월', '기말환율', '평균환율', '역사적환율']],
+                          on=['통화', '결산월'], how='left', validate='many_to_one')
+
+        absent = keys[keys['기말환율'].isna()]
+        if not absent.empty:
+            pairs = ', '.join(f"{c} {p}" for c, p in absent[['통화', '결산월']].itertuples(index=False))
+            raise ValueError(f"환율 없음: {pairs}")
+
+        # 구분별 환율 선택 (미매핑 계정은 기말환율)
+        rate_columns = ['기말환율', '평균환율', '역사적환율']
+        column_of = {section: rate_columns.index(column) for section, column in RATE_BY_SECTION.items()}
+        column_idx = tb['구분'].map(column_of).fillna(0).to_numpy(dtype=int)
+        rate_table = keys[rate_columns].to_numpy(dtype=float)
+
+        tb['환율'] = rate_table[codes, column_idx]
+        tb['환산잔액'] = tb['잔액'].to_numpy() * tb['환율'].to_numpy()
+        return tb
+
+    def cta_entries(self, translated):
+        """환산 차이 (법인별 환산 시산표 불일치) → 해외사업환산손익"""
+        totals = translated.groupby(['결산월', '회사코드'], as_index=False)['환산잔액'].sum()
+        totals = totals[totals['환산잔액'].round(2) != 0]
+
+        return pd.DataFrame({
+            '결산월': totals['결산월'],
+            '조정유형': '환산차이',
+            '회사코드': totals['회사코드'],
+            '거래상대': None,
+            '계정과목': CTA_ACCOUNT,
+            '항목': None,
+            '금액': -totals['환산잔액'],
+        })
+
+    def intercompany_lines(self, translated):
+        """내부거래 행 (거래상대가 연결 대상 법인이고 대사 쌍 항목인 행) + 대사 유형/측"""
+        type_of = {}
+        side_of = {}
+        for pair, receivable_lines, payable_lines in IC_PAIRS:
+            type_of.update({line: pair for line in receivable_lines + payable_lines})
+            side_of.update({line: '채권측' for line in receivable_lines})
+            side_of.update({line: '채무측' for line in payable_lines})
+
+        entities = translated['회사코드'].unique()
+        ic = translated[translated['거래상대'].isin(entities) & translated['항목'].isin(list(type_of))]
+        columns = ['결산월', '회사코드', '거래상대', '계정과목', '항목', '환산잔액']
+        return ic[columns].assign(유형=ic['항목'].map(type_of), 측=ic['항목'].map(side_of))
+
+    def match_intercompany(self, ic):
+        """채권/수익 측과 채무/비용 측을 (결산월, 유형, 법인 ↔ 거래상대) 해시 조인으로 대사
+
+        ic: intercompany_lines 결과
+        """
+        if ic.empty:
+            return pd.DataFrame(columns=MATCH_COLUMNS)
+
+        keys = ['결산월', '유형', '회사코드', '거래상대']
+        grouped = ic.groupby(keys + ['측'], as_index=False, sort=False)['환산잔액'].sum()
+        receivable = grouped[grouped['측'] == '채권측'].drop(columns='측').rename(columns={'환산잔액': '채권측금액'})
+        payable = grouped[grouped['측'] == '채무측'].drop(columns='측').rename(columns={'환산잔액': '채무측금액'})
+
+        # 채무측은 (거래상대 → 회사코드) 방향으로 뒤집어 조인
+        payable = payable.rename(columns={'회사코드': '거래상대', '거래상대': '회사코드'})
+        matches = receivable.merge(payable, on=keys, how='outer')
+        matches[['채권측금액', '채무측금액']] = matches[['채권측금액', '채무측금액']].fillna(0.0)
+
+        # 채권(차변 +)과 채무(대변 -)가 같으면 합계 0
+        matches['차이'] = matches['채권측금액'] + matches['채무측금액']
+        matches['상태'] = np.where(matches['차이'].abs() <= self.tolerance, '일치', '차이')
+
+        return matches[MATCH_COLUMNS].sort_values(keys, ignore_index=True)
+
+    def elimination_entries(self, ic):
+        """내부거래 제거 분개 (법인/거래상대/계정별 잔액 역분개, ic: intercompany_lines 결과)"""
+        eliminated = ic.groupby(['결산월', '유형', '회사코드', '거래상대', '계정과목', '항목'],
+                                as_index=False, sort=False)['환산잔액'].sum()
+
+        return pd.DataFrame({
+            '결산월': eliminated['결산월'],
+            '조정유형': '내부거래제거(' + eliminated['유형'] + ')',
+            '회사코드': eliminated['회사코드'],
+            '거래상대': eliminated['거래상대'],
+            '계정과목': eliminated['계정과목'],
+            '항목': eliminated['항목'],
+            '금액': -eliminated['환산잔액'],
+        })
+
+    def difference_entries(self, matches):
+        """양쪽을 모두 제거한 뒤 남는 대사 차이 → 내부거래차이 계정 (연결 시산표 차대 일치 유지)"""
+        matches = matches[matches['차이'] != 0]
+
+        return pd.DataFrame({
+            '결산월': matches['결산월'],
+            '조정유형': '내부거래차이(' + matches['유형'] + ')',
+            '회사코드': matches['회사코드'],
+            '거래상대': matches['거래상대'],
+            '계정과목': IC_DIFFERENCE_ACCOUNT,
+            '항목': None,
+            '금액': matches['차이'],
+        })
+
+    def build_trial_balance(self, translated, entries):
+        """환산 시산표 + 연결 조정 → 결산월별 연결 시산표 [결산월, 계정과목, 차변, 대변]"""
+        lines = pd.concat([
+            translated[['결산월', '계정과목', '환산잔액']].rename(columns={'환산잔액': '금액'}),
+            entries[['결산월', '계정과목', '금액']],
+        ], ignore_index=True)
+
+        tb = lines.groupby(['결산월', '계정과목'], as_index=False, sort=True)['금액'].sum()
+        tb['차변'] = tb['금액'].clip(lower=0)
+        tb['대변'] = (-tb['금액']).clip(lower=0) + 0.0  # -0.0 방지
+        return tb.drop(columns='금액')
+
+# CLI 실행 지원
+if __name__ == "__main__":
+    # 사용법: python -m modules.consolidation 시산표.xlsx 환율.xlsx [결산월]
+    if len(sys.argv) < 3:
+        print("사용법: python -m modules.consolidation 법인별시산표.xlsx 환율.xlsx [결산월]")
+        sys.exit(1)
+
+    result = Consolidator().consolidate(pd.read_excel(sys.argv[1]), pd.read_excel(sys.argv[2]))
+    result.export_to_excel(f"data/output/연결시산표_{연결_회사코드}.xlsx")
+
+    if len(sys.argv) > 3:
+        fs = result.to_financial_statements(sys.argv[3])
+        fs.generate_statements()
+        fs.validate()
+        fs.calculate_financial_ratios()
+        fs.export_to_excel(f"data/output/연결재무제표_{sys.argv[3]}.xlsx")
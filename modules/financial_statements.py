@@ -3,21 +3,39 @@
 import pandas as pd
 import numpy as np
 import os
-import time
 from datetime import datetime, timedelta
 import json
 import sys
 sys.path.append('..')
 from NEO_SAP import SAPAutomation
-from config import 회사코드, 결산월, 파일저장경로
+from config import 회사코드, 결산월, 파일저장경로, 누적보관개월, SAP스크립트폴더
+from modules.result_store import hash_trial_balance
+from modules.validation import TrialBalanceValidator, statement_lines, previous_period
+from modules.account_mapping import load_chart
+from modules.rolling_workbook import RollingWorkbook
+from modules.sap_script import load_script
+from modules.layouts import read_trial_balance, match_columns, apply_sign_convention
 
 class FinancialStatements:
-    def __init__(self):
-        self.sap = SAPAutomation()
+    def __init__(self, company=None, period=None, store=None, sap=None, chart=None):
+        self.company = company or 회사코드
+        self.period = period or 결산월
+        self._sap = sap
+        self.chart = chart or load_chart()
         self.trial_balance = None
         self.previous_year_data = None
         self.statements = {}
         self.ratios = {}
+        self.store = store
+        self.cache_key = None
+        self.validation_report = None
+    
+    @property
+    def sap(self):
+        """SAP 세션 (처음 사용할 때 연결)"""
+        if self._sap is None:
+            self._sap = SAPAutomation()
+        return self._sap
         
     def load_trial_balance(self, file_path=None):
         """SAP 시산표 데이터 로드"""
@@ -26,36 +44,40 @@ class FinancialStatements:
             file_path = self.extract_trial_balance_from_sap()
         
         try:
-            self.trial_balance = pd.read_excel(file_path)
+            # 등록된 내보내기 레이아웃이면 필요한 컬럼만 타입 지정해 읽기
+            try:
+                self.trial_balance = read_trial_balance(file_path)
+            except ValueError as e:
+                print(f"⚠️ 레이아웃 판별 실패, 전체 컬럼 읽기: {e}")
+                self.trial_balance = pd.read_excel(file_path)
             print(f"✅ 시산표 로드 완료: {file_path}")
             
             # 데이터 정제
             self.trial_balance = self.clean_trial_balance(self.trial_balance)
             
+            # 결과 캐시 키 (회사코드, 결산월, 시산표 해시, 매핑 버전)
+            if self.store is not None:
+                self.cache_key = (self.company, self.period, hash_trial_balance(self.trial_balance), self.chart.version)
+            
         except Exception as e:
             print(f"❌ 시산표 로드 실패: {e}")
     
-    def extract_trial_balance_from_sap(self):
-        """SAP에서 시산표 직접 추출"""
+    def extract_trial_balance_from_sap(self, sap=None):
+        """SAP에서 시산표 직접 추출 (sap: 사용할 세션, 기본값은 self.sap)"""
         print("📊 SAP에서 시산표 추출 중...")
         
+        if sap is None:
+            sap = self.sap
+        
         try:
-            # F.01 (시산표) T-code 실행
-            self.sap.enter_the_wutang("F.01")
+            # F.01 (시산표) 스크립트: T-code → 조회 조건 → 실행 → Excel 내보내기
+            script = load_script(os.path.join(SAP스크립트폴더, "trial_balance.json"))
             
-            # 조회 조건 설정
-            year, month = 결산월.split(".")
-            self.sap.find("wnd[0]/usr/ctrlCOMPANY_CODE/txtS_BUKRS-LOW").text = 회사코드
-            self.sap.find("wnd[0]/usr/ctrlFISCAL_YEAR/txtS_GJAHR-LOW").text = year
-            self.sap.find("wnd[0]/usr/ctrlPERIOD/txtS_MONAT-LOW").text = month
-            
-            # 실행 및 Excel 내보내기
-            self.sap.실행()
-            time.sleep(3)
-            self.sap.export_to_excel()
+            year, month = self.period.split(".")
+            file_path = f"{파일저장경로}시산표_{self.company}_{self.period}.xlsx"
+            script.replay(sap, company=self.company, year=year, month=month, path=file_path)
             
             # 파일 경로 반환
-            file_path = f"{파일저장경로}시산표_{결산월}.xlsx"
             return file_path
             
         except Exception as e:
@@ -67,26 +89,13 @@ class FinancialStatements:
         # 빈 행 제거
         df = df.dropna(how='all')
         
-        # 계정과목, 차변, 대변 컬럼 식별
+        # 계정번호, 계정과목, 차변, 대변 (또는 잔액) 컬럼 식별 (영문 헤더는 단어 단위 일치)
         df.columns = df.columns.astype(str)
+        roles = match_columns(list(df.columns))
+        df = df.rename(columns={df.columns[idx]: role for role, idx in roles.items()})
         
-        # 계정과목 컬럼 찾기
-        account_cols = [col for col in df.columns if any(keyword in col.lower() for keyword in ['계정', 'account', '과목'])]
-        debit_cols = [col for col in df.columns if any(keyword in col.lower() for keyword in ['차변', 'debit', 'dr'])]
-        credit_cols = [col for col in df.columns if any(keyword in col.lower() for keyword in ['대변', 'credit', 'cr'])]
-        
-        # 표준 컬럼명으로 변경
-        if account_cols:
-            df = df.rename(columns={account_cols[0]: '계정과목'})
-        if debit_cols:
-            df = df.rename(columns={debit_cols[0]: '차변'})
-        if credit_cols:
-            df = df.rename(columns={credit_cols[0]: '대변'})
-        
-        # 숫자 컬럼 변환
-        for col in ['차변', '대변']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        # 숫자 컬럼 변환 (잔액만 있으면 차변/대변으로 분리)
+        df = apply_sign_convention(df)
         
         return df
     
@@ -96,6 +105,13 @@ class FinancialStatements:
             print("❌ 시산표 데이터가 없습니다.")
             return
         
+        if self.cache_key is not None:
+            cached = self.store.get(self.cache_key, 'statements')
+            if cached is not None:
+                self.statements = cached
+                print("⚡ 재무제표 캐시 사용")
+                return self.statements
+        
         print("📋 재무제표 생성 중...")
         
         # 1. 재무상태표 생성
@@ -104,6 +120,9 @@ class FinancialStatements:
         # 2. 손익계산서 생성
         self.statements['손익계산서'] = self.create_income_statement()
         
+        if self.cache_key is not None:
+            self.store.put(self.cache_key, 'statements', self.statements)
+        
         print("✅ 재무제표 생성 완료")
         return self.statements
     
@@ -111,40 +130,41 @@ class FinancialStatements:
         """재무상태표 생성"""
         balance_sheet = {}
         
-        # 계정과목별 잔액 계산
-        df = self.trial_balance.copy()
-        df['잔액'] = df['차변'] - df['대변']
+        # 항목별 잔액 계산
+        balances = self.line_balances()
         
         # 자산 항목
         balance_sheet['자산'] = {
             '유동자산': {
-                '현금및현금성자산': self.get_account_balance(df, ['현금', '보통예금', '당좌예금']),
-                '매출채권': self.get_account_balance(df, ['매출채권', '받을어음']),
-                '재고자산': self.get_account_balance(df, ['재고자산', '상품', '제품', '원재료']),
+                '현금및현금성자산': balances.get('현금및현금성자산', 0),
+                '매출채권': balances.get('매출채권', 0),
+                '재고자산': balances.get('재고자산', 0),
             },
             '비유동자산': {
-                '유형자산': self.get_account_balance(df, ['토지', '건물', '기계장치', '차량운반구', '비품']),
-                '무형자산': self.get_account_balance(df, ['영업권', '특허권', '소프트웨어']),
+                '유형자산': balances.get('유형자산', 0),
+                '무형자산': balances.get('무형자산', 0),
             }
         }
         
         # 부채 항목
         balance_sheet['부채'] = {
             '유동부채': {
-                '매입채무': self.get_account_balance(df, ['매입채무', '지급어음']),
-                '단기차입금': self.get_account_balance(df, ['단기차입금', '운전자금대출']),
-                '미지급금': self.get_account_balance(df, ['미지급금', '미지급비용']),
+                '매입채무': balances.get('매입채무', 0),
+                '단기차입금': balances.get('단기차입금', 0),
+                '미지급금': balances.get('미지급금', 0),
             },
             '비유동부채': {
-                '장기차입금': self.get_account_balance(df, ['장기차입금', '사채']),
+                '장기차입금': balances.get('장기차입금', 0),
             }
         }
         
         # 자본 항목
         balance_sheet['자본'] = {
-            '자본금': self.get_account_balance(df, ['자본금', '출자금']),
-            '이익잉여금': self.get_account_balance(df, ['이익잉여금', '미처분이익잉여금']),
-            '당기순이익': self.get_account_balance(df, ['당기순이익'])
+            '자본금': balances.get('자본금', 0),
+            '이익잉여금': balances.get('이익잉여금', 0),
+            '기타포괄손익누계액': balances.get('기타포괄손익누계액', 0),
+            '연결조정차이': balances.get('연결조정차이', 0),
+            '당기순이익': balances.get('당기순이익', 0)
         }
         
         return balance_sheet
@@ -153,25 +173,24 @@ class FinancialStatements:
         """손익계산서 생성"""
         income_statement = {}
         
-        df = self.trial_balance.copy()
-        df['잔액'] = df['차변'] - df['대변']
+        balances = self.line_balances()
         
         # 수익 항목 (대변 잔액)
         income_statement['수익'] = {
-            '매출액': abs(self.get_account_balance(df, ['매출', '상품매출', '제품매출'])),
-            '기타수익': abs(self.get_account_balance(df, ['잡수익', '이자수익', '임대수익']))
+            '매출액': abs(balances.get('매출액', 0)),
+            '기타수익': abs(balances.get('기타수익', 0))
         }
         
         # 비용 항목 (차변 잔액)
         income_statement['비용'] = {
-            '매출원가': self.get_account_balance(df, ['매출원가', '상품매출원가']),
+            '매출원가': balances.get('매출원가', 0),
             '판매비와관리비': {
-                '급여': self.get_account_balance(df, ['급여', '임금']),
-                '임차료': self.get_account_balance(df, ['임차료', '지급임차료']),
-                '감가상각비': self.get_account_balance(df, ['감가상각비']),
-                '기타판관비': self.get_account_balance(df, ['광고선전비', '접대비', '통신비'])
+                '급여': balances.get('급여', 0),
+                '임차료': balances.get('임차료', 0),
+                '감가상각비': balances.get('감가상각비', 0),
+                '기타판관비': balances.get('기타판관비', 0)
             },
-            '금융비용': self.get_account_balance(df, ['이자비용', '차입금이자'])
+            '금융비용': balances.get('금융비용', 0)
         }
         
         # 손익 계산
@@ -184,25 +203,53 @@ class FinancialStatements:
                                               income_statement['수익']['기타수익'] - 
                                               income_statement['비용']['금융비용'])
         
-        income_statement['법인세비용'] = self.get_account_balance(df, ['법인세비용'])
+        income_statement['법인세비용'] = balances.get('법인세비용', 0)
         income_statement['당기순이익'] = income_statement['법인세비용차감전순이익'] - income_statement['법인세비용']
         
         return income_statement
     
-    def get_account_balance(self, df, keywords):
-        """계정과목 키워드로 잔액 합계 계산"""
-        total = 0
+    def classified_trial_balance(self):
+        """계정 매핑으로 분류한 시산표 (잔액, 구분, 항목 컬럼 추가)"""
+        df = self.trial_balance.copy()
+        df['잔액'] = df['차변'] - df['대변']
+        return self.chart.classify_trial_balance(df)
+    
+    def line_balances(self):
+        """재무제표 항목별 잔액 합계 (계정마다 하나의 항목에만 집계)"""
+        df = self.classified_trial_balance()
+        return df.groupby('항목')['잔액'].sum()
+    
+    def validate(self):
+        """시산표/재무제표 검증 (차대일치, 대차평균, 매핑, 부호, 전기 대비 변동)"""
+        if self.trial_balance is None:
+            print("❌ 시산표 데이터가 없습니다.")
+            return None
+        
+        print("🔍 재무제표 검증 중...")
         
-        for keyword in keywords:
-            mask = df['계정과목'].str.contains(keyword, na=False, case=False)
-            matched_rows = df[mask]
-            if not matched_rows.empty:
-                total += matched_rows['잔액'].sum()
+        tb = self.trial_balance.assign(회사코드=self.company, 결산월=self.period)
+        lines = statement_lines(self.statements, self.company, self.period)
         
-        return total
+        # 전기 재무제표가 캐시에 있으면 변동 검증에 사용
+        if self.store is not None:
+            prior = previous_period(self.period)
+            previous = self.store.latest(self.company, prior, 'statements')
+            if previous:
+                lines = pd.concat([statement_lines(previous, self.company, prior), lines], ignore_index=True)
+        
+        self.validation_report = TrialBalanceValidator(self.chart).validate(tb, lines)
+        self.validation_report.print_summary()
+        return self.validation_report
     
     def calculate_financial_ratios(self):
         """재무비율 계산"""
+        if self.cache_key is not None:
+            cached = self.store.get(self.cache_key, 'ratios')
+            if cached is not None:
+                self.ratios = cached
+                print("⚡ 재무비율 캐시 사용")
+                return self.ratios
+        
         print("📈 재무비율 계산 중...")
         
         bs = self.statements.get('재무상태표', {})
@@ -232,13 +279,21 @@ class FinancialStatements:
         self.ratios['순이익률'] = (net_income / sales * 100) if sales > 0 else 0
         self.ratios['ROE'] = (net_income / total_equity * 100) if total_equity > 0 else 0
         
+        if self.cache_key is not None:
+            self.store.put(self.cache_key, 'ratios', self.ratios)
+        
         print("✅ 재무비율 계산 완료")
         return self.ratios
     
     def export_to_excel(self, output_file=None):
         """Excel 파일로 내보내기"""
         if output_file is None:
-            output_file = f"{파일저장경로}재무제표_{결산월}.xlsx"
+            output_file = f"{파일저장경로}재무제표_{self.period}.xlsx"
+        
+        # 같은 입력으로 이미 내보낸 파일이 그대로 있으면 생략
+        if self.cache_key is not None and self.store.export_is_current(self.cache_key, output_file):
+            print(f"⚡ Excel 내보내기 생략 (변경 없음): {output_file}")
+            return output_file
         
         try:
             with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
@@ -256,12 +311,73 @@ class FinancialStatements:
                 if self.ratios:
                     ratio_df = pd.DataFrame(list(self.ratios.items()), columns=['비율명', '값'])
                     ratio_df.to_excel(writer, sheet_name='재무비율', index=False)
+                
+                # 검증결과
+                if self.validation_report is not None:
+                    self.validation_report.findings.to_excel(writer, sheet_name='검증결과', index=False)
+            
+            if self.cache_key is not None:
+                self.store.put_export(self.cache_key, output_file)
             
             print(f"✅ Excel 내보내기 완료: {output_file}")
+            return output_file
             
         except Exception as e:
             print(f"❌ Excel 내보내기 실패: {e}")
     
+    def export_incremental(self, workbook_file=None):
+        """누적 통합문서에 이번 결산월 열/시트만 추가 또는 교체"""
+        if workbook_file is None:
+            workbook_file = f"{파일저장경로}재무제표_{self.company}_누적.xlsx"
+        
+        try:
+            book = RollingWorkbook(workbook_file, keep_periods=누적보관개월)
+            
+            # 재무제표/재무비율: 결산월 열
+            for name in ['재무상태표', '손익계산서']:
+                if name in self.statements:
+                    df = self.convert_to_dataframe(self.statements[name], name)
+                    book.upsert_period(name, self.period, dict(zip(df['항목'], df['금액'])))
+            if self.ratios:
+                book.upsert_period('재무비율', self.period, self.ratios, key_header='비율명', number_format='0.00')
+            
+            # 요약: 결산월 행
+            book.upsert_row('요약', self.period, self.summary_metrics())
+            
+            # 검증결과: 결산월 전용 시트
+            if self.validation_report is not None:
+                book.replace_sheet(f"검증결과_{self.period}", self.validation_report.findings)
+            
+            expired = book.trim(['재무상태표', '손익계산서', '재무비율'], '요약', ['검증결과'])
+            book.save()
+            
+            if expired:
+                print(f"🧹 보관 기간 지난 결산월 삭제: {', '.join(expired)}")
+            print(f"✅ 누적 Excel 갱신 완료: {workbook_file} ({self.period})")
+            return workbook_file
+            
+        except Exception as e:
+            print(f"❌ 누적 Excel 갱신 실패: {e}")
+    
+    def summary_metrics(self):
+        """요약 시트 지표 (자산/부채/자본 총계, 주요 손익, 재무비율)"""
+        bs = self.statements.get('재무상태표', {})
+        is_data = self.statements.get('손익계산서', {})
+        
+        def total(d):
+            return sum(total(v) if isinstance(v, dict) else v for v in d.values())
+        
+        metrics = {
+            '자산총계': total(bs.get('자산', {})),
+            '부채총계': total(bs.get('부채', {})),
+            '자본총계': total(bs.get('자본', {})),
+            '매출액': is_data.get('수익', {}).get('매출액', 0),
+            '영업이익': is_data.get('영업이익', 0),
+            '당기순이익': is_data.get('당기순이익', 0),
+        }
+        metrics.update(self.ratios)
+        return metrics
+    
     def convert_to_dataframe(self, data, statement_type):
         """재무제표 데이터를 DataFrame으로 변환"""
         rows = []
@@ -289,10 +405,13 @@ if __name__ == "__main__":
     # 2. 재무제표 생성
     fs.generate_statements()
     
-    # 3. 재무비율 계산
+    # 3. 검증
+    fs.validate()
+    
+    # 4. 재무비율 계산
     fs.calculate_financial_ratios()
     
-    # 4. Excel 내보내기
+    # 5. Excel 내보내기
     fs.export_to_excel()
     
     print("✅ 재무제표 생성 완료!")
\ No newline at end of file
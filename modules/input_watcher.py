@@ -0,0 +1,194 @@
+# modules/input_watcher.py
+
+import os
+import sys
+import time
+import pandas as pd
+sys.path.append('..')
+from config import 감시주기, 매출분석_대용량모드
+from modules.sales_analyzer import SalesAnalyzer
+
+# 집계 차원 (파일/시트 차원은 파일별 기여분으로만 관리)
+TOTAL_DIMENSIONS = ['month', 'branch', 'measure']
+
+# 감시 대상 확장자 (Excel 임시 파일 '~$'는 제외)
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def scan_folder(folder):
+    """폴더의 Excel 파일 목록 → {경로: (수정시각 ns, 크기)}"""
+    manifest = {}
+    try:
+        entries = list(os.scandir(folder))
+    except FileNotFoundError:
+        return manifest
+
+    for entry in entries:
+        if not entry.is_file() or entry.name.startswith('~$'):
+            continue
+        if not entry.name.lower().endswith(EXCEL_EXTENSIONS):
+            continue
+        stat = entry.stat()
+        manifest[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    return manifest
+
+
+def diff_manifest(old, new):
+    """두 목록 비교 → (추가, 변경, 삭제) 경로 목록"""
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(path for path in set(old) & set(new) if old[path] != new[path])
+    return added, changed, removed
+
+
+class InputWatcher:
+    """입력 폴더 감시 + 증분 재집계
+
+    - 수정시각/크기 목록으로 추가/변경/삭제된 파일만 다시 수집
+    - (월, 지점, 측정값) 합계에서 이전 기여분을 빼고 새 기여분을 더함
+    - 대시보드에 표시되는 값이 바뀐 경우에만 다시 생성
+    """
+
+    def __init__(self, input_folder="data/input/", output_file="data/output/sales_analysis_dashboard.html",
+                 interval=None, out_of_core=None):
+        self.input_folder = input_folder
+        self.output_file = output_file
+        self.interval = interval or 감시주기
+        self.analyzer = SalesAnalyzer(out_of_core=매출분석_대용량모드 if out_of_core is None else out_of_core)
+
+        self.manifest = {}
+        self.failed = {}  # 수집 실패한 경로 → (수정시각 ns, 크기) (바뀔 때까지 다시 읽지 않음)
+        self.contributions = {}  # 경로 → (월, 지점, 측정값)별 합계 Series
+        self.totals = self._empty_contribution()
+        self.counts = self._empty_contribution()  # 각 합계에 기여한 파일 수 (0이 되면 행 삭제)
+        self.rendered = None
+
+    @staticmethod
+    def _empty_contribution():
+        index = pd.MultiIndex.from_arrays([[], [], []], names=TOTAL_DIMENSIONS)
+        return pd.Series(dtype=float, index=index)
+
+    def _contribution(self, fact_chunks):
+        """파일 하나의 팩트 조각 → (월, 지점, 측정값)별 합계"""
+        fact_chunks = [chunk for chunk in fact_chunks if not chunk.empty]
+        if not fact_chunks:
+            return self._empty_contribution()
+
+        facts = pd.concat(fact_chunks, ignore_index=True)
+        facts['value'] = facts['value'].astype(float)
+        return facts.groupby(TOTAL_DIMENSIONS, sort=False)['value'].sum()
+
+    def _apply(self, old, new):
+        """합계 갱신: 이전 기여분 빼기 + 새 기여분 더하기"""
+        if not old.empty:
+            self.totals = self.totals.sub(old, fill_value=0)
+            self.counts = self.counts.sub(pd.Series(1, index=old.index), fill_value=0)
+        if not new.empty:
+            self.totals = self.totals.add(new, fill_value=0)
+            self.counts = self.counts.add(pd.Series(1, index=new.index), fill_value=0)
+
+        alive = self.counts > 0
+        self.totals = self.totals[alive]
+        self.counts = self.counts[alive].astype(int)
+
+    def _reingest(self, path):
+        """파일 하나 다시 수집 (실패하면 이전 기여분 유지, 파일이 바뀌면 재시도)"""
+        filename = os.path.basename(path)
+        previous = self.analyzer.detach_file(filename)
+        try:
+            new = self._contribution(self.analyzer.ingest_file(path))
+        except Exception as e:
+            # 복사 중인 파일/손상된 파일 등: 일부만 수집된 시트를 버리고 이전 시트 복원
+            self.analyzer.remove_file(filename)
+            self.analyzer.data.update(previous)
+            print(f"⚠️ {filename} 수집 실패 (파일이 바뀌면 재시도): {e}")
+            return False
+
+        # 새 시트 수집에 성공한 뒤에만 이전 시트 삭제
+        self.analyzer.discard_sheets(previous)
+        self._apply(self.contributions.get(path, self._empty_contribution()), new)
+        self.contributions[path] = new
+        return True
+
+    def _remove(self, path):
+        self.analyzer.remove_file(os.path.basename(path))
+        self._apply(self.contributions.pop(path, self._empty_contribution()), self._empty_contribution())
+
+    def _refresh_analysis(self):
+        """누적 합계를 팩트 테이블로 사용해 트렌드 재계산 (월 × 지점 × 측정값 행만 처리)"""
+        facts = self.totals.rename('value').reset_index()
+        for col in TOTAL_DIMENSIONS:
+            facts[col] = facts[col].astype('category')
+        self.analyzer.facts = facts
+        return self.analyzer.analyze_trends()
+
+    def _dashboard_state(self, results):
+        """대시보드에 표시되는 값 (바뀌었을 때만 다시 생성)"""
+        return (
+            tuple(sorted(results.get('monthly_sales', {}).items())),
+            tuple(sorted(results.get('growth_rates', {}).items())),
+            len({key[1] for key in self.analyzer.data}),
+        )
+
+    def poll(self):
+        """한 번 감시: 바뀐 파일만 처리 후 요약 반환 (변경 없으면 None)"""
+        current = scan_folder(self.input_folder)
+        added, changed, removed = diff_manifest(self.manifest, current)
+
+        # 실패했을 때와 (수정시각, 크기)가 같은 파일은 다시 읽지 않음 (복사가 끝나거나 고쳐지면 재시도)
+        self.failed = {path: signature for path, signature in self.failed.items() if current.get(path) == signature}
+        added = [path for path in added if path not in self.failed]
+        changed = [path for path in changed if path not in self.failed]
+        if not (added or changed or removed):
+            return None
+
+        started = time.perf_counter()
+
+        for path in removed:
+            self._remove(path)
+            self.manifest.pop(path, None)
+            print(f"🗑️ 삭제: {os.path.basename(path)}")
+
+        for path in added + changed:
+            if self._reingest(path):
+                self.manifest[path] = current[path]
+                print(f"{'🆕 추가' if path in added else '♻️ 변경'}: {os.path.basename(path)}")
+            else:
+                self.failed[path] = current[path]
+
+        results = self._refresh_analysis()
+        state = self._dashboard_state(results)
+        rendered = state != self.rendered
+        if rendered:
+            self.analyzer.generate_dashboard(self.output_file)
+            self.rendered = state
+
+        summary = {
+            'added': len(added),
+            'changed': len(changed),
+            'removed': len(removed),
+            'dashboard_updated': rendered,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+        print(f"⏱️ 증분 갱신 {summary['seconds']}초 (추가 {len(added)}, 변경 {len(changed)}, "
+              f"삭제 {len(removed)}, 대시보드 {'갱신' if rendered else '변경 없음'})")
+        return summary
+
+    def run(self):
+        """Ctrl+C까지 폴더 감시"""
+        print(f"👀 입력 폴더 감시 시작: {self.input_folder} ({self.interval}초 간격, Ctrl+C로 종료)")
+
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("\n👋 입력 폴더 감시를 종료합니다.")
+        finally:
+            if self.analyzer.spill_store is not None:
+                self.analyzer.spill_store.cleanup()
+
+# CLI 실행 지원
+if __name__ == "__main__":
+    InputWatcher(sys.argv[1] if len(sys.argv) > 1 else "data/input/").run()
@@ -0,0 +1,259 @@
+# modules/layouts.py
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import pandas as pd
+from openpyxl import load_workbook
+sys.path.append('..')
+from config import 레이아웃등록파일
+
+# 표준 컬럼 역할 (역할, 한글 키워드(부분 일치), 영문 키워드(단어 단위 일치))
+# 판별 순서대로 한 컬럼에 한 역할만 배정 (계정번호를 계정과목보다 먼저)
+ROLE_KEYWORDS = [
+    ('계정번호', ['계정번호', '계정코드'], ['g l', 'gl', 'account no', 'account number', 'acct no']),
+    ('차변', ['차변'], ['debit', 'dr']),
+    ('대변', ['대변'], ['credit', 'cr']),
+    ('잔액', ['잔액'], ['balance']),
+    ('계정과목', ['계정', '과목'], ['account', 'acct']),
+]
+
+TEXT_ROLES = ['계정번호', '계정과목']
+AMOUNT_ROLES = ['차변', '대변', '잔액']
+
+# 헤더 행을 찾을 때 읽는 앞부분 행 수
+SAMPLE_ROWS = 20
+
+# openpyxl 스트리밍으로 읽는 확장자 (그 외는 pandas)
+STREAM_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def header_tokens(header):
+    """헤더 → 영문/숫자 단어 목록 (예: 'G/L Acct No.' → ['g', 'l', 'acct', 'no'])"""
+    return re.findall(r'[0-9a-z]+', str(header).lower())
+
+
+def matches_role(header, korean, english):
+    """헤더가 역할 키워드와 일치하는지 (영문은 단어 단위라 'credit'/'address'가 'dr'에 걸리지 않음)"""
+    if header is None or header != header:
+        return False
+    if any(keyword in str(header) for keyword in korean):
+        return True
+
+    tokens = header_tokens(header)
+    for phrase in english:
+        words = phrase.split()
+        if any(tokens[i:i + len(words)] == words for i in range(len(tokens) - len(words) + 1)):
+            return True
+    return False
+
+
+def match_columns(headers):
+    """헤더 목록 → {역할: 컬럼 위치}"""
+    roles = {}
+    for role, korean, english in ROLE_KEYWORDS:
+        for idx, header in enumerate(headers):
+            if idx not in roles.values() and matches_role(header, korean, english):
+                roles[role] = idx
+                break
+    return roles
+
+
+def is_complete(roles):
+    """시산표로 읽을 수 있는 역할 조합인지 (계정과목 + 차변/대변 또는 잔액)"""
+    return '계정과목' in roles and (('차변' in roles and '대변' in roles) or '잔액' in roles)
+
+
+def find_header_row(sample):
+    """앞부분 행에서 헤더 행 찾기 → (행 위치, 헤더 목록) 또는 (None, None)"""
+    for row in range(len(sample)):
+        headers = sample.iloc[row].tolist()
+        if is_complete(match_columns(headers)):
+            return row, headers
+    return None, None
+
+
+def fingerprint(header_row, headers):
+    """레이아웃 식별값 (헤더 행 위치 + 정규화한 헤더)"""
+    cells = ['' if h is None or h != h else str(h).strip().lower() for h in headers]
+    while cells and not cells[-1]:
+        cells.pop()
+    signature = json.dumps([header_row, cells], ensure_ascii=False)
+    return hashlib.sha1(signature.encode('utf-8')).hexdigest()[:16]
+
+
+def apply_sign_convention(df, credit_sign=1):
+    """금액 컬럼 → 차변/대변 (양수) 표준화
+
+    credit_sign=-1: 대변을 음수로 내보내는 레이아웃
+    잔액만 있는 레이아웃: 양수는 차변, 음수는 대변
+    """
+    for col in AMOUNT_ROLES:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    if '차변' not in df.columns and '잔액' in df.columns:
+        df['차변'] = df['잔액'].clip(lower=0)
+        df['대변'] = (-df['잔액']).clip(lower=0)
+    elif credit_sign < 0 and '대변' in df.columns:
+        df['대변'] = -df['대변']
+
+    return df
+
+
+class ReaderPlan:
+    """레이아웃별 읽기 계획 (헤더 행, 읽을 컬럼, 타입, 부호 규칙)"""
+
+    def __init__(self, name, header_row, columns, credit_sign=1, headers=None):
+        self.name = name
+        self.header_row = header_row
+        self.credit_sign = credit_sign
+        self.headers = headers or []
+
+        # 차변/대변이 있으면 잔액 컬럼은 읽지 않음
+        if '차변' in columns and '대변' in columns:
+            columns = {role: idx for role, idx in columns.items() if role != '잔액'}
+        self.columns = columns
+
+        ordered = sorted(columns.items(), key=lambda item: item[1])
+        self.usecols = [idx for _, idx in ordered]
+        self.names = [role for role, _ in ordered]
+        self.dtypes = {role: str for role in TEXT_ROLES if role in columns}
+
+    def __repr__(self):
+        return f"ReaderPlan({self.name}, header_row={self.header_row}, columns={self.names})"
+
+    def read(self, file_path):
+        """필요한 컬럼만 타입을 지정해 읽고 표준 컬럼 [계정번호, 계정과목, 차변, 대변]으로 반환"""
+        if str(file_path).lower().endswith(STREAM_EXTENSIONS):
+            df = self._stream(file_path)
+        else:
+            # .xls 등은 openpyxl로 열 수 없어 pandas로 읽음
+            df = pd.read_excel(file_path, header=None, skiprows=self.header_row + 1,
+                               usecols=self.usecols, names=self.names, dtype=self.dtypes)
+        df = df.dropna(how='all')
+        df = apply_sign_convention(df, self.credit_sign)
+
+        columns = [col for col in ['계정번호', '계정과목', '차변', '대변'] if col in df.columns]
+        return df[columns]
+
+    def _stream(self, file_path):
+        """openpyxl 읽기 전용 모드로 계획된 컬럼 범위만 행 단위로 읽기
+
+        pd.read_excel(usecols=...)은 시트 전체 셀을 파싱한 뒤 컬럼을 고르므로
+        첫/마지막 계획 컬럼 사이만 읽고 계획된 위치의 값만 남깁니다.
+        """
+        first, last = self.usecols[0], self.usecols[-1]
+        offsets = [idx - first for idx in self.usecols]
+
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            rows = [[row[i] for i in offsets]
+                    for row in ws.iter_rows(min_row=self.header_row + 2, min_col=first + 1,
+                                            max_col=last + 1, values_only=True)]
+        finally:
+            wb.close()
+
+        df = pd.DataFrame(rows, columns=self.names)
+        for role in self.dtypes:
+            df[role] = df[role].map(str, na_action='ignore')
+        return df
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'header_row': self.header_row,
+            'columns': self.columns,
+            'credit_sign': self.credit_sign,
+            'headers': self.headers,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['header_row'], data['columns'],
+                   data.get('credit_sign', 1), data.get('headers'))
+
+
+class LayoutRegistry:
+    """SAP 내보내기 레이아웃 등록부 (JSON)
+
+    파일마다 앞부분 행만 읽어 헤더 식별값을 구하고,
+    등록된 레이아웃이면 저장된 읽기 계획을 그대로 사용합니다.
+    처음 보는 레이아웃은 한 번만 판별해 등록합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or 레이아웃등록파일
+        self.layouts = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.layouts = json.load(f).get('layouts', {})
+
+    def plan_for(self, file_path):
+        """파일의 읽기 계획 (헤더를 찾지 못하면 ValueError)"""
+        sample = pd.read_excel(file_path, header=None, nrows=SAMPLE_ROWS)
+        header_row, headers = find_header_row(sample)
+        if header_row is None:
+            raise ValueError(f"시산표 헤더를 찾을 수 없습니다: {os.path.basename(file_path)}")
+
+        key = fingerprint(header_row, headers)
+        with self._lock:
+            if key not in self.layouts:
+                plan = self.detect(key, header_row, headers, sample.iloc[header_row + 1:])
+                self.layouts[key] = plan.to_dict()
+                self.save()
+                print(f"🆕 새 내보내기 레이아웃 등록: {plan}")
+
+            return ReaderPlan.from_dict(self.layouts[key])
+
+    @staticmethod
+    def detect(key, header_row, headers, rows):
+        """헤더/앞부분 데이터로 역할과 부호 규칙 판별"""
+        columns = match_columns(headers)
+
+        # 대변 값이 대부분 음수면 음수 대변 레이아웃
+        credit_sign = 1
+        if '대변' in columns:
+            credits = pd.to_numeric(rows.iloc[:, columns['대변']], errors='coerce')
+            if (credits < 0).sum() > (credits > 0).sum():
+                credit_sign = -1
+
+        names = [str(h).strip() for h in headers if h is not None and h == h]
+        return ReaderPlan(f"layout_{key}", header_row, columns, credit_sign, names)
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'layouts': self.layouts}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.path)
+
+
+_registries = {}
+
+
+def load_registry(path=None):
+    """레이아웃 등록부 (경로별로 한 번만 로드)"""
+    path = os.path.abspath(path or 레이아웃등록파일)
+    if path not in _registries:
+        _registries[path] = LayoutRegistry(path)
+    return _registries[path]
+
+
+def read_trial_balance(file_path, registry=None):
+    """등록된 레이아웃으로 시산표 읽기 (필요한 컬럼만, 타입 지정)"""
+    return (registry or load_registry()).plan_for(file_path).read(file_path)
+
+# CLI 실행 지원
+if __name__ == "__main__":
+    # 사용법: python -m modules.layouts 시산표.xlsx [...]
+    registry = load_registry()
+    for file_path in sys.argv[1:]:
+        plan = registry.plan_for(file_path)
+        print(f"📄 {file_path}: {plan}")
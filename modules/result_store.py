@@ -0,0 +1,168 @@
+# modules/result_store.py
+
+import sqlite3
+import hashlib
+import json
+import os
+import sys
+import threading
+from contextlib import closing
+from datetime import datetime
+import pandas as pd
+sys.path.append('..')
+from config import 결과저장소경로
+
+
+def hash_trial_balance(df):
+    """시산표 내용 해시 (행 순서 포함, 컬럼명 포함)"""
+    digest = hashlib.sha256()
+    digest.update("|".join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_file(file_path):
+    """파일 지문 (크기, 수정시각, SHA-256)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    stat = os.stat(file_path)
+    return {
+        'path': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'sha256': digest.hexdigest(),
+    }
+
+
+class ResultStore:
+    """재무제표 결과 저장소 (SQLite)
+
+    키: (회사코드, 결산월, 시산표 해시, 매핑 버전)
+    단계: statements(재무제표), ratios(재무비율), export(내보낸 파일 지문)
+    """
+
+    STAGES = ('statements', 'ratios', 'export')
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or 결과저장소경로
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.stats = {stage: {'hit': 0, 'miss': 0} for stage in self.STAGES}
+        # 서비스/마감 스케줄러의 여러 스레드가 같은 저장소를 공유하므로 적중/미스 집계는 잠금 후 갱신
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.db_path, timeout=30))
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    company TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    tb_hash TEXT NOT NULL,
+                    mapping_version TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (company, period, tb_hash, mapping_version, stage)
+                )
+            """)
+            conn.commit()
+
+    def _record(self, stage, hit):
+        with self._lock:
+            self.stats[stage]['hit' if hit else 'miss'] += 1
+
+    def get(self, key, stage):
+        """단계 결과 조회 (없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM results WHERE company=? AND period=? AND tb_hash=? "
+                "AND mapping_version=? AND stage=?",
+                (*key, stage)
+            ).fetchone()
+
+        if stage != 'export':
+            self._record(stage, row is not None)
+        return json.loads(row[0]) if row else None
+
+    def latest(self, company, period, stage):
+        """시산표 해시와 무관하게 가장 최근 저장된 단계 결과 (전기 비교용)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM results WHERE company=? AND period=? AND stage=? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (company, period, stage)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, stage, payload):
+        """단계 결과 저장 (같은 키는 덮어쓰기)"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, stage, json.dumps(payload, ensure_ascii=False, default=float),
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+            conn.commit()
+
+    def export_is_current(self, key, output_file):
+        """저장된 지문과 디스크의 내보낸 파일이 같은지 확인"""
+        saved = self.get(key, 'export')
+        current = False
+
+        if saved and os.path.exists(output_file) and saved['path'] == os.path.abspath(output_file):
+            stat = os.stat(output_file)
+            if stat.st_size == saved['size'] and stat.st_mtime == saved['mtime']:
+                current = True
+            elif stat.st_size == saved['size']:
+                current = fingerprint_file(output_file)['sha256'] == saved['sha256']
+
+        self._record('export', current)
+        return current
+
+    def put_export(self, key, output_file):
+        """내보낸 파일 지문 저장"""
+        self.put(key, 'export', fingerprint_file(output_file))
+
+    def invalidate(self, company=None, period=None):
+        """저장된 결과 삭제 (조건 없으면 전체 삭제)"""
+        query = "DELETE FROM results WHERE 1=1"
+        params = []
+        if company:
+            query += " AND company=?"
+            params.append(company)
+        if period:
+            query += " AND period=?"
+            params.append(period)
+
+        with self._connect() as conn:
+            deleted = conn.execute(query, params).rowcount
+            conn.commit()
+
+        print(f"🗑️ 캐시 삭제: {deleted}건 (회사코드={company or '전체'}, 결산월={period or '전체'})")
+        return deleted
+
+    def report(self):
+        """캐시 적중/미스 요약 출력"""
+        with self._lock:
+            stats = {stage: dict(counts) for stage, counts in self.stats.items()}
+
+        print("📦 결과 캐시 현황:")
+        for stage, counts in stats.items():
+            print(f"   - {stage}: 적중 {counts['hit']} / 미스 {counts['miss']}")
+        return stats
+
+# CLI 실행 지원
+if __name__ == "__main__":
+    # 사용법: python -m modules.result_store invalidate [회사코드] [결산월]
+    args = sys.argv[1:]
+
+    if args and args[0] == 'invalidate':
+        ResultStore().invalidate(*args[1:3])
+    else:
+        print("사용법: python -m modules.result_store invalidate [회사코드] [결산월]")
@@ -0,0 +1,171 @@
+# modules/rolling_workbook.py
+
+import os
+from copy import copy
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
+
+
+class RollingWorkbook:
+    """결산월별 열을 누적하는 재무제표 통합문서
+
+    각 시트는 A열에 항목, 1행에 결산월을 두고 결산월마다 열 하나를 사용합니다.
+    새 결산월은 해당 열만 결산월 순서 위치에 추가/교체하고 기존 열의 서식은 그대로 둡니다.
+    """
+
+    def __init__(self, file_path, keep_periods=None):
+        self.file_path = file_path
+        self.keep_periods = keep_periods
+
+        if os.path.exists(file_path):
+            self.wb = load_workbook(file_path)
+        else:
+            self.wb = Workbook()
+            self.wb.remove(self.wb.active)
+
+    def _sheet(self, name, key_header):
+        if name in self.wb.sheetnames:
+            return self.wb[name]
+        ws = self.wb.create_sheet(name)
+        ws.cell(row=1, column=1, value=key_header)
+        return ws
+
+    @staticmethod
+    def _header_columns(ws):
+        """결산월 → 열 번호"""
+        return {str(ws.cell(row=1, column=col).value): col
+                for col in range(2, ws.max_column + 1)
+                if ws.cell(row=1, column=col).value is not None}
+
+    @staticmethod
+    def _key_rows(ws):
+        """항목 → 행 번호"""
+        return {str(ws.cell(row=row, column=1).value): row
+                for row in range(2, ws.max_row + 1)
+                if ws.cell(row=row, column=1).value is not None}
+
+    def upsert_period(self, sheet_name, period, values, key_header='항목', number_format='#,##0'):
+        """시트에 결산월 열 추가/교체 (values: {항목: 값})"""
+        ws = self._sheet(sheet_name, key_header)
+        columns = self._header_columns(ws)
+        rows = self._key_rows(ws)
+
+        col = columns.get(period)
+        if col is None:
+            # 결산월 순서 위치에 열 추가 (이후 결산월 열은 오른쪽으로 밀림)
+            later = [c for p, c in columns.items() if p > period]
+            if later:
+                col = min(later)
+                ws.insert_cols(col)
+                self._copy_column_format(ws, col + 1, col)
+            else:
+                col = ws.max_column + 1 if columns else 2
+                self._copy_column_format(ws, col - 1, col)
+            ws.cell(row=1, column=col, value=period)
+        else:
+            # 같은 결산월 재실행: 기존 값 지우고 다시 기록
+            for row in rows.values():
+                ws.cell(row=row, column=col).value = None
+
+        for key, value in values.items():
+            row = rows.get(key)
+            if row is None:
+                row = ws.max_row + 1
+                ws.cell(row=row, column=1, value=key)
+                rows[key] = row
+            cell = ws.cell(row=row, column=col, value=value)
+            if not cell.has_style:
+                cell.number_format = number_format
+
+    def upsert_row(self, sheet_name, period, values, key_header='결산월', number_format='#,##0'):
+        """요약 시트에 결산월 행 추가/교체 (values: {지표: 값})"""
+        ws = self._sheet(sheet_name, key_header)
+        metrics = self._header_columns(ws)
+        rows = self._key_rows(ws)
+        row = rows.get(period)
+
+        if row is None:
+            # 결산월 순서 위치에 행 추가
+            later = [r for p, r in rows.items() if p > period]
+            if later:
+                row = min(later)
+                ws.insert_rows(row)
+            else:
+                row = ws.max_row + 1
+            ws.cell(row=row, column=1, value=period)
+
+        for metric, value in values.items():
+            col = metrics.get(metric)
+            if col is None:
+                col = ws.max_column + 1
+                ws.cell(row=1, column=col, value=metric)
+                metrics[metric] = col
+            cell = ws.cell(row=row, column=col, value=value)
+            if not cell.has_style:
+                cell.number_format = number_format
+
+    def replace_sheet(self, sheet_name, df):
+        """결산월 전용 시트 교체 (예: 검증결과_2025.05, 같은 접두어 시트끼리 결산월 순서 유지)"""
+        names = self.wb.sheetnames
+        if sheet_name in names:
+            index = names.index(sheet_name)
+            self.wb.remove(self.wb[sheet_name])
+        else:
+            prefix = sheet_name.rsplit('_', 1)[0] + '_'
+            siblings = [i for i, name in enumerate(names) if name.startswith(prefix)]
+            later = [i for i in siblings if names[i] > sheet_name]
+            index = later[0] if later else (siblings[-1] + 1 if siblings else None)
+        ws = self.wb.create_sheet(sheet_name, index)
+        ws.append([str(col) for col in df.columns])
+        for record in df.itertuples(index=False):
+            ws.append([None if v != v else v for v in record])
+
+    @staticmethod
+    def _copy_column_format(ws, src, dst):
+        if src < 2:
+            return
+        for row in range(1, ws.max_row + 1):
+            source = ws.cell(row=row, column=src)
+            if source.has_style:
+                ws.cell(row=row, column=dst)._style = copy(source._style)
+        width = ws.column_dimensions[get_column_letter(src)].width
+        if width:
+            ws.column_dimensions[get_column_letter(dst)].width = width
+
+    def trim(self, period_sheets, summary_sheet, sheet_prefixes):
+        """보관 개월 수를 넘는 오래된 결산월 열/행/시트 삭제"""
+        if not self.keep_periods:
+            return []
+
+        periods = set()
+        for name in period_sheets:
+            if name in self.wb.sheetnames:
+                periods.update(self._header_columns(self.wb[name]))
+        expired = sorted(periods)[:-self.keep_periods]
+        if not expired:
+            return []
+
+        for name in period_sheets:
+            if name in self.wb.sheetnames:
+                ws = self.wb[name]
+                columns = self._header_columns(ws)
+                for col in sorted((columns[p] for p in expired if p in columns), reverse=True):
+                    ws.delete_cols(col)
+
+        if summary_sheet in self.wb.sheetnames:
+            ws = self.wb[summary_sheet]
+            rows = self._key_rows(ws)
+            for row in sorted((rows[p] for p in expired if p in rows), reverse=True):
+                ws.delete_rows(row)
+
+        for period in expired:
+            for prefix in sheet_prefixes:
+                name = f"{prefix}_{period}"
+                if name in self.wb.sheetnames:
+                    self.wb.remove(self.wb[name])
+
+        return expired
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        self.wb.save(self.file_path)
@@ -13,14 +13,60 @@ import sys
 sys.path.append('..')
 from NEO_SAP import SAPAutomation
 from config import 회사코드, 결산월, 파일저장경로
+from modules.columnar_store import ColumnarStore
+
+# 측정값 매핑 (컬럼명 키워드 → 측정값, 먼저 일치하는 측정값 사용)
+MEASURE_KEYWORDS = [
+    ('매출', ['매출', 'SALES']),
+    ('비용', ['비용', 'COST', 'EXPENSE']),
+]
+
+# 지점(조직) 컬럼 키워드
+BRANCH_KEYWORDS = ['지점', '부서', '사업장', 'BRANCH']
+
+# 팩트 테이블 컬럼 (long format)
+FACT_COLUMNS = ['month', 'source_file', 'sheet', 'branch', 'measure', 'value']
+FACT_DIMENSIONS = ['month', 'source_file', 'sheet', 'branch', 'measure']
+
+def map_measures(columns):
+    """컬럼명 → 측정값 매핑 (측정값이 아닌 컬럼은 제외)"""
+    measures = {}
+    for col in columns:
+        name = str(col).upper()
+        for measure, keywords in MEASURE_KEYWORDS:
+            if any(keyword.upper() in name for keyword in keywords):
+                measures[col] = measure
+                break
+    return measures
+
+def find_branch_column(columns):
+    """지점 컬럼 찾기 (없으면 None)"""
+    for col in columns:
+        if any(keyword.upper() in str(col).upper() for keyword in BRANCH_KEYWORDS):
+            return col
+    return None
 
 class SalesAnalyzer:
-    def __init__(self):
-        self.sap = SAPAutomation()
+    def __init__(self, out_of_core=False, spill_dir="data/temp/sales_spill", sap=None, company=None, period=None):
+        self.company = company or 회사코드
+        self.period = period or 결산월
+        self._sap = sap
         self.data = {}
+        self.facts = pd.DataFrame(columns=FACT_COLUMNS)
         self.budget_data = None
         self.analysis_results = {}
         
+        # 대용량 모드: 정제된 시트는 디스크에 두고 핸들과 집계된 팩트만 메모리에 보관
+        self.out_of_core = out_of_core
+        self.spill_store = ColumnarStore(spill_dir) if out_of_core else None
+    
+    @property
+    def sap(self):
+        """SAP 세션 (처음 사용할 때 연결)"""
+        if self._sap is None:
+            self._sap = SAPAutomation()
+        return self._sap
+        
     def collect_excel_files(self, input_folder="../data/input/"):
         """지정 폴더의 모든 Excel 파일 자동 수집 및 통합"""
         print(f"📁 {input_folder}에서 Excel 파일 수집 중...")
@@ -40,32 +86,105 @@ class SalesAnalyzer:
         
         print(f"📊 발견된 파일: {len(all_files)}개")
         
+        fact_chunks = []
         for file_path in all_files:
             try:
-                # 파일명에서 월별 정보 추출
-                filename = os.path.basename(file_path)
-                month_key = self.extract_month_from_filename(filename)
-                
-                # Excel 파일 읽기 (여러 시트 지원)
-                xl_file = pd.ExcelFile(file_path)
-                
-                for sheet_name in xl_file.sheet_names:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    
-                    # 데이터 정제
-                    df = self.clean_data(df)
-                    
-                    # 데이터 저장
-                    key = f"{month_key}_{sheet_name}"
-                    self.data[key] = df
-                    
-                print(f"✅ {filename} 처리 완료")
+                fact_chunks.extend(self.ingest_file(file_path))
+                print(f"✅ {os.path.basename(file_path)} 처리 완료")
                 
             except Exception as e:
-                print(f"❌ {filename} 처리 실패: {e}")
+                print(f"❌ {os.path.basename(file_path)} 처리 실패: {e}")
+        
+        self.facts = self.build_fact_table(fact_chunks)
         
         return self.data
     
+    def ingest_file(self, file_path):
+        """Excel 파일 하나를 읽어 시트별 데이터 저장 후 팩트 조각 목록 반환"""
+        # 파일명에서 월별 정보 추출
+        filename = os.path.basename(file_path)
+        month_key = self.extract_month_from_filename(filename)
+        
+        fact_chunks = []
+        
+        # Excel 파일 읽기 (여러 시트 지원, 한 번만 열기)
+        with pd.ExcelFile(file_path) as xl_file:
+            for sheet_name in xl_file.sheet_names:
+                df = xl_file.parse(sheet_name)
+                
+                # 데이터 정제
+                df = self.clean_data(df)
+                
+                # 측정값 컬럼 → long format 팩트 (수집 시 한 번만 매핑)
+                fact_chunks.append(self.to_facts(df, month_key, filename, sheet_name))
+                
+                # 데이터 저장 (대용량 모드는 디스크로 내려쓰기)
+                key = (month_key, filename, sheet_name)
+                if self.out_of_core:
+                    self.data[key] = self.spill_store.spill(df)
+                    del df
+                else:
+                    self.data[key] = df
+        
+        return fact_chunks
+    
+    def detach_file(self, filename):
+        """파일 하나의 시트 데이터를 떼어 반환 (디스크에 내려쓴 데이터는 유지)"""
+        return {key: self.data.pop(key) for key in [key for key in self.data if key[1] == filename]}
+
+    def discard_sheets(self, sheets):
+        """떼어낸 시트 데이터 삭제 (대용량 모드는 디스크 데이터도 삭제)"""
+        if self.out_of_core:
+            for sheet in sheets.values():
+                self.spill_store.discard(sheet)
+
+    def remove_file(self, filename):
+        """파일 하나의 시트 데이터 제거 (디스크 데이터 포함)"""
+        self.discard_sheets(self.detach_file(filename))
+    
+    def to_facts(self, df, month, source_file, sheet):
+        """시트 DataFrame → long format 팩트 조각"""
+        measures = map_measures(df.columns)
+        if not measures:
+            return pd.DataFrame(columns=FACT_COLUMNS)
+        
+        measure_columns = list(measures)
+        values = df[measure_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        n_rows = len(df)
+        
+        branch_col = find_branch_column([col for col in df.columns if col not in measures])
+        branches = df[branch_col].astype(str).to_numpy() if branch_col is not None else np.full(n_rows, '전체', dtype=object)
+        
+        # 컬럼 우선(column-major)으로 펼쳐 (행 × 측정값 컬럼) → long format
+        facts = pd.DataFrame({
+            'month': month,
+            'source_file': source_file,
+            'sheet': sheet,
+            'branch': np.tile(branches, len(measure_columns)),
+            'measure': np.repeat([measures[col] for col in measure_columns], n_rows),
+            'value': values.ravel(order='F'),
+        })
+        facts = facts[facts['value'].notna()]
+        
+        # 대용량 모드는 (월, 파일, 시트, 지점, 측정값) 단위로 미리 집계
+        if self.out_of_core:
+            facts = facts.groupby(FACT_DIMENSIONS, as_index=False, sort=False)['value'].sum()
+        
+        return facts
+    
+    def build_fact_table(self, fact_chunks):
+        """팩트 조각 통합 (차원 컬럼은 category로 변환)"""
+        fact_chunks = [chunk for chunk in fact_chunks if not chunk.empty]
+        if not fact_chunks:
+            return pd.DataFrame(columns=FACT_COLUMNS)
+        
+        facts = pd.concat(fact_chunks, ignore_index=True)
+        for col in FACT_DIMENSIONS:
+            facts[col] = facts[col].astype('category')
+        facts['value'] = facts['value'].astype(float)
+        
+        return facts
+    
     def extract_month_from_filename(self, filename):
         """파일명에서 년월 정보 추출"""
         import re
@@ -85,8 +204,8 @@ class SalesAnalyzer:
                     year, month = month, year
                 return f"{year}.{month.zfill(2)}"
         
-        # 패턴이 없으면 현재 월 사용
-        return 결산월
+        # 패턴이 없으면 분석 결산월 사용
+        return self.period
     
     def clean_data(self, df):
         """데이터 정제 및 표준화"""
@@ -117,31 +236,63 @@ class SalesAnalyzer:
         # 계절성 분석
         seasonality = self.analyze_seasonality(monthly_sales)
         
+        # 지점별/측정값별 합계
+        branch_sales = self.aggregate('branch', measure='매출').to_dict()
+        measure_totals = {}
+        if not self.facts.empty:
+            measure_totals = self.aggregate(['month', 'measure']).unstack(fill_value=0).to_dict(orient='index')
+        
         self.analysis_results.update({
             'monthly_sales': monthly_sales,
             'quarterly_trends': quarterly_trends,
             'growth_rates': growth_rates,
-            'seasonality': seasonality
+            'seasonality': seasonality,
+            'branch_sales': branch_sales,
+            'measure_totals': measure_totals
         })
         
         print("✅ 트렌드 분석 완료")
         return self.analysis_results
     
+    def aggregate(self, by, measure=None):
+        """팩트 테이블 집계 (by: 차원 컬럼명 또는 목록, measure: 측정값 필터)"""
+        facts = self.facts
+        if measure is not None:
+            facts = facts[facts['measure'] == measure]
+        
+        return facts.groupby(by, observed=True, sort=True)['value'].sum()
+    
     def calculate_monthly_sales(self):
         """월별 매출 계산"""
-        monthly_data = {}
+        return self.aggregate('month', measure='매출').to_dict()
+    
+    def calculate_quarterly_trends(self, monthly_sales):
+        """분기별 매출 합계"""
+        quarterly_data = {}
+        
+        for month, total in sorted(monthly_sales.items()):
+            year, mm = month.split('.')
+            quarter_key = f"{year}-Q{(int(mm) - 1) // 3 + 1}"
+            quarterly_data[quarter_key] = quarterly_data.get(quarter_key, 0) + total
+        
+        return quarterly_data
+    
+    def calculate_growth_rates(self, monthly_sales):
+        """전월 대비 성장률 (%)"""
+        series = pd.Series(monthly_sales, dtype=float).sort_index()
+        growth = series.pct_change() * 100
+        
+        return growth.replace([np.inf, -np.inf], np.nan).dropna().round(2).to_dict()
+    
+    def analyze_seasonality(self, monthly_sales):
+        """월(1~12)별 계절 지수 (전체 평균 = 100)"""
+        series = pd.Series(monthly_sales, dtype=float)
+        if series.empty or series.mean() == 0:
+            return {}
         
-        for key, df in self.data.items():
-            month = key.split('_')[0]
-            
-            # '매출' 키워드가 포함된 컬럼 찾기
-            sales_columns = [col for col in df.columns if '매출' in str(col) or 'SALES' in str(col).upper()]
-            
-            if sales_columns:
-                total_sales = df[sales_columns].sum().sum()
-                monthly_data[month] = total_sales
+        by_calendar_month = series.groupby(series.index.str[-2:]).mean()
         
-        return monthly_data
+        return (by_calendar_month / series.mean() * 100).round(2).to_dict()
     
     def generate_dashboard(self, output_file="../data/output/sales_analysis_dashboard.html"):
         """인터랙티브 HTML 대시보드 생성"""
@@ -160,7 +311,7 @@ class SalesAnalyzer:
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{결산월} 매출 분석 대시보드</title>
+    <title>{self.period} 매출 분석 대시보드</title>
     <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
@@ -173,15 +324,15 @@ class SalesAnalyzer:
 <body>
     <div class="container">
         <div class="header">
-            <h1>{결산월} 매출 분석 대시보드</h1>
+            <h1>{self.period} 매출 분석 대시보드</h1>
             <p>자동 생성된 매출 분석 리포트</p>
         </div>
         
         <div class="summary-card">
             <h3>분석 요약</h3>
-            <p><strong>회사코드:</strong> {회사코드}</p>
-            <p><strong>분석 기간:</strong> {결산월}</p>
-            <p><strong>데이터 수집:</strong> {len(self.data)}개 파일</p>
+            <p><strong>회사코드:</strong> {self.company}</p>
+            <p><strong>분석 기간:</strong> {self.period}</p>
+            <p><strong>데이터 수집:</strong> {len({key[1] for key in self.data})}개 파일</p>
         </div>
         
         <div class="chart-container">
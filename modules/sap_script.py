@@ -0,0 +1,224 @@
+# modules/sap_script.py
+
+import json
+import os
+import re
+import string
+import time
+
+# 컨트롤 ID 형식 (예: wnd[0]/usr/ctrlPERIOD/txtS_MONAT-LOW)
+CONTROL_ID = re.compile(r'^wnd\[\d+\](/[A-Za-z]+[^/\s]*)*$')
+
+# 단계 종류
+STEP_KINDS = ('tcode', 'variant', 'set', 'execute', 'key', 'press', 'export', 'wait')
+
+# 자주 쓰는 가상 키 (SAP GUI sendVKey 번호)
+VKEY_ENTER = 0
+VKEY_F8 = 8
+VKEY_SHIFT_F5 = 17      # 변형 가져오기
+VKEY_CTRL_SHIFT_F9 = 45  # 로컬 파일로 내보내기
+
+
+class ScriptError(ValueError):
+    """트랜잭션 스크립트 정의 오류"""
+
+
+def _placeholders(value):
+    if not isinstance(value, str):
+        return set()
+    return {name for _, name, _, _ in string.Formatter().parse(value) if name}
+
+
+def _check_id(control_id, step_no):
+    if not CONTROL_ID.match(control_id):
+        raise ScriptError(f"{step_no}단계: 잘못된 컨트롤 ID '{control_id}'")
+    return control_id
+
+
+class CompiledScript:
+    """컴파일된 트랜잭션 스크립트 (COM 호출 목록)
+
+    ops: ('tcode', 코드) | ('set', ID, 값) | ('vkey', 창 ID, 키) | ('press', ID) | ('wait', 초)
+    각 op에는 원래 단계 이름이 붙어 단계별 소요시간 보고에 사용됩니다.
+    """
+
+    def __init__(self, name, ops, params):
+        self.name = name
+        self.ops = ops
+        self.params = params
+
+    def __repr__(self):
+        return f"CompiledScript({self.name}, ops={len(self.ops)}, params={sorted(self.params)})"
+
+    def replay(self, sap, **params):
+        """SAPAutomation(또는 GuiSession 호환 객체)에서 스크립트 실행
+
+        반환: {'steps': [(단계, 초, COM 호출 수), ...], 'com_calls': 전체 호출 수, 'seconds': 전체 소요시간}
+        """
+        missing = self.params - set(params)
+        if missing:
+            raise ScriptError(f"{self.name}: 필요한 값 누락 {sorted(missing)}")
+
+        session = getattr(sap, 'session', sap)
+        timings = []
+        total_calls = 0
+        started = time.perf_counter()
+
+        for label, op in self.ops:
+            step_started = time.perf_counter()
+            calls = self._run_op(session, op, params)
+            total_calls += calls
+
+            # 같은 단계의 op는 하나로 합쳐 보고
+            elapsed = time.perf_counter() - step_started
+            if timings and timings[-1][0] == label:
+                prev_label, prev_elapsed, prev_calls = timings[-1]
+                timings[-1] = (prev_label, prev_elapsed + elapsed, prev_calls + calls)
+            else:
+                timings.append((label, elapsed, calls))
+
+        seconds = time.perf_counter() - started
+        print(f"🎬 {self.name} 실행 완료: {len(timings)}단계, COM 호출 {total_calls}회, {seconds:.2f}초")
+        return {'steps': timings, 'com_calls': total_calls, 'seconds': seconds}
+
+    @staticmethod
+    def _run_op(session, op, params):
+        """op 하나 실행 후 COM 호출 수 반환 (SAP GUI 스크립팅 호출은 응답까지 대기하므로 고정 sleep 없음)"""
+        kind = op[0]
+
+        if kind == 'tcode':
+            session.StartTransaction(op[1].format(**params))
+            return 1
+        if kind == 'set':
+            session.findById(op[1]).text = op[2].format(**params) if isinstance(op[2], str) else op[2]
+            return 2
+        if kind == 'vkey':
+            session.findById(op[1]).sendVKey(op[2])
+            return 2
+        if kind == 'press':
+            session.findById(op[1]).press()
+            return 2
+        if kind == 'wait':
+            time.sleep(op[1])
+            return 0
+        raise ScriptError(f"알 수 없는 op: {kind}")
+
+
+def compile_script(spec):
+    """스크립트 정의(dict) → CompiledScript
+
+    - 단계 종류와 컨트롤 ID 형식을 한 번만 검증
+    - 연속된 T-code 이동은 마지막 것만, 연속된 필드 입력은 하나로 합침 (같은 필드는 마지막 값)
+    - T-code 이동은 okcode 입력 + Enter 대신 StartTransaction 한 번으로 실행
+    """
+    name = spec.get('name', 'script')
+    steps = spec.get('steps', [])
+    if not steps:
+        raise ScriptError(f"{name}: 단계가 없습니다.")
+
+    # 1. 정규화 + 검증
+    normalized = []
+    for step_no, step in enumerate(steps, 1):
+        if len(step) != 1 or next(iter(step)) not in STEP_KINDS:
+            raise ScriptError(f"{name} {step_no}단계: 단계는 {STEP_KINDS} 중 하나의 키만 가져야 합니다: {step}")
+        kind, arg = next(iter(step.items()))
+
+        if kind == 'set':
+            arg = {_check_id(cid, step_no): value for cid, value in arg.items()}
+        elif kind == 'press':
+            _check_id(arg, step_no)
+        elif kind == 'key':
+            arg = {'window': _check_id(arg.get('window', 'wnd[0]'), step_no), 'vkey': int(arg['vkey'])}
+        elif kind == 'wait':
+            arg = float(arg)
+        normalized.append((kind, arg))
+
+    # 2. 중복 이동/입력 병합
+    merged = []
+    for kind, arg in normalized:
+        prev_kind = merged[-1][0] if merged else None
+        if kind == 'tcode' and prev_kind == 'tcode':
+            merged[-1] = (kind, arg)
+        elif kind == 'set' and prev_kind == 'set':
+            merged[-1] = (kind, {**merged[-1][1], **arg})
+        else:
+            merged.append((kind, arg))
+
+    # 3. op 목록 생성
+    ops = []
+    for kind, arg in merged:
+        if kind == 'tcode':
+            ops.append(('tcode', ('tcode', str(arg))))
+        elif kind == 'variant':
+            ops.append(('variant', ('vkey', 'wnd[0]', VKEY_SHIFT_F5)))
+            ops.append(('variant', ('set', 'wnd[1]/usr/txtV-LOW', str(arg))))
+            ops.append(('variant', ('set', 'wnd[1]/usr/txtENAME-LOW', '')))
+            ops.append(('variant', ('press', 'wnd[1]/tbar[0]/btn[8]')))
+        elif kind == 'set':
+            ops.extend(('set', ('set', cid, value)) for cid, value in arg.items())
+        elif kind == 'execute':
+            ops.append(('execute', ('vkey', 'wnd[0]', VKEY_F8)))
+        elif kind == 'key':
+            ops.append(('key', ('vkey', arg['window'], arg['vkey'])))
+        elif kind == 'press':
+            ops.append(('press', ('press', arg)))
+        elif kind == 'export':
+            ops.append(('export', ('vkey', 'wnd[0]', VKEY_CTRL_SHIFT_F9)))
+            ops.append(('export', ('set', 'wnd[1]/usr/ctrlSSLN_EXPORT/txtDY_PATH', str(arg))))
+            ops.append(('export', ('press', 'wnd[1]/tbar[0]/btn[11]')))
+        elif kind == 'wait':
+            ops.append(('wait', ('wait', arg)))
+
+    params = set()
+    for _, op in ops:
+        if op[0] in ('tcode', 'set'):
+            params |= _placeholders(op[-1])
+
+    return CompiledScript(name, ops, params)
+
+
+_compiled = {}
+
+
+def load_script(path):
+    """JSON 스크립트 파일 로드 + 컴파일 (파일이 바뀌지 않았으면 재사용)"""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+
+    cached = _compiled.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, encoding='utf-8') as f:
+            _compiled[path] = (mtime, compile_script(json.load(f)))
+
+    return _compiled[path][1]
+
+
+class FakeControl:
+    """FakeSession 컨트롤 (속성 입력/메서드 호출 기록)"""
+
+    def __init__(self, session, control_id):
+        object.__setattr__(self, '_session', session)
+        object.__setattr__(self, '_id', control_id)
+
+    def __setattr__(self, name, value):
+        self._session.calls.append(('set', self._id, name, value))
+
+    def sendVKey(self, key):
+        self._session.calls.append(('sendVKey', self._id, key))
+
+    def press(self):
+        self._session.calls.append(('press', self._id))
+
+
+class FakeSession:
+    """SAP 없이 스크립트를 검증하는 가짜 GuiSession (COM 호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def findById(self, control_id):
+        self.calls.append(('findById', control_id))
+        return FakeControl(self, control_id)
+
+    def StartTransaction(self, tcode):
+        self.calls.append(('StartTransaction', tcode))
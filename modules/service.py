@@ -0,0 +1,215 @@
+# modules/service.py
+
+import json
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append('..')
+from NEO_SAP import SAPSessionPool
+from config import 파일저장경로, 서비스포트, 서비스_동시작업수, SAP세션수, 매출분석_대용량모드
+from modules.financial_statements import FinancialStatements
+from modules.sales_analyzer import SalesAnalyzer
+from modules.result_store import ResultStore
+
+
+class AutomationService:
+    """상주 작업 서비스 (SAP 세션, 결과 캐시를 유지한 채 작업 실행)
+
+    작업 종류:
+    - statements: {"type": "statements", "company": "h182", "period": "2025.05", "file": (선택)}
+    - sales_dashboard: {"type": "sales_dashboard", "folder": "data/input/", "company": (선택), "period": (선택),
+                        "output": (선택, 기본값 data/output/sales_dashboard_<작업 ID>.html)}
+    """
+
+    def __init__(self, max_workers=None, sap_sessions=None):
+        self.store = ResultStore()
+        self.sap_pool = SAPSessionPool(size=sap_sessions or SAP세션수)
+        self.max_workers = max_workers or 서비스_동시작업수
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self.handlers = {
+            'statements': self.run_statements_job,
+            'sales_dashboard': self.run_sales_job,
+        }
+
+    def submit(self, spec):
+        """작업 등록 후 작업 ID 반환"""
+        if not isinstance(spec, dict):
+            raise ValueError("작업 요청은 JSON 객체여야 합니다.")
+        job_type = spec.get('type')
+        if job_type not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류: {job_type}")
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'id': job_id,
+            'spec': spec,
+            'status': 'queued',
+            'submitted_at': datetime.now().isoformat(timespec='seconds'),
+            'queue_ms': None,
+            'latency_ms': None,
+            'result': None,
+            'error': None,
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+
+        submitted = time.perf_counter()
+        self.executor.submit(self._run, job, submitted)
+        return job_id
+
+    def _run(self, job, submitted):
+        started = time.perf_counter()
+        job['status'] = 'running'
+        job['queue_ms'] = round((started - submitted) * 1000, 1)
+
+        try:
+            job['result'] = self.handlers[job['spec']['type']](job)
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = 'failed'
+
+        job['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        print(f"⏱️ 작업 {job['id']} ({job['spec']['type']}) {job['status']}: "
+              f"{job['latency_ms']}ms (대기 {job['queue_ms']}ms)")
+
+    def run_statements_job(self, job):
+        """재무제표 작업: 추출(SAP 세션 풀) → 생성 → 검증 → 비율 → 내보내기"""
+        spec = job['spec']
+        fs = FinancialStatements(spec.get('company'), spec.get('period'), store=self.store)
+
+        file_path = spec.get('file')
+        if file_path is None:
+            file_path = self.sap_pool.submit(lambda sap: fs.extract_trial_balance_from_sap(sap)).result()
+            if file_path is None:
+                raise RuntimeError("SAP 시산표 추출 실패")
+
+        fs.load_trial_balance(file_path)
+        if fs.trial_balance is None:
+            raise RuntimeError(f"시산표 로드 실패: {file_path}")
+
+        fs.generate_statements()
+        report = fs.validate()
+        fs.calculate_financial_ratios()
+        # 같은 결산월의 다른 회사 작업과 파일이 겹치지 않도록 회사코드 포함
+        output_file = fs.export_to_excel(spec.get('output') or f"{파일저장경로}재무제표_{fs.company}_{fs.period}.xlsx")
+
+        return {
+            'company': fs.company,
+            'period': fs.period,
+            'output_file': output_file,
+            'ratios': fs.ratios,
+            'validation_passed': report.passed if report is not None else None,
+        }
+
+    def run_sales_job(self, job):
+        """매출 대시보드 작업"""
+        spec = job['spec']
+        folder = spec.get('folder', 'data/input/')
+        # 동시에 실행되는 대시보드 작업이 같은 파일을 덮어쓰지 않도록 작업 ID로 기본 파일명 지정
+        output_file = spec.get('output') or f"data/output/sales_dashboard_{job['id']}.html"
+
+        analyzer = SalesAnalyzer(out_of_core=매출분석_대용량모드, company=spec.get('company'), period=spec.get('period'))
+        try:
+            analyzer.collect_excel_files(folder)
+            analyzer.analyze_trends()
+
+            return {
+                'folder': folder,
+                'output_file': analyzer.generate_dashboard(output_file),
+                'files': len({key[1] for key in analyzer.data}),
+            }
+        finally:
+            if analyzer.spill_store is not None:
+                analyzer.spill_store.cleanup()
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._lock:
+            return [{k: job[k] for k in ('id', 'status', 'latency_ms')} for job in self.jobs.values()]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.sap_pool.shutdown()
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """localhost HTTP API
+
+    POST /jobs          작업 등록 → {"id": ...}
+    GET  /jobs          작업 목록
+    GET  /jobs/<id>     작업 상태/결과/소요시간
+    GET  /health        상태 확인
+    """
+
+    service = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', 'jobs': len(self.service.jobs)})
+        elif self.path == '/jobs':
+            self._send(200, self.service.list_jobs())
+        elif self.path.startswith('/jobs/'):
+            job = self.service.get(self.path[len('/jobs/'):])
+            if job is None:
+                self._send(404, {'error': '작업을 찾을 수 없습니다.'})
+            else:
+                self._send(200, job)
+        else:
+            self._send(404, {'error': '알 수 없는 경로'})
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self._send(404, {'error': '알 수 없는 경로'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            spec = json.loads(self.rfile.read(length) or b'{}')
+            self._send(202, {'id': self.service.submit(spec)})
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        # 요청 로그는 생략 (작업 완료 시 소요시간만 출력)
+        pass
+
+
+def serve(port=None):
+    """상주 서비스 실행 (Ctrl+C로 종료)"""
+    port = port or 서비스포트
+    service = AutomationService()
+    ServiceRequestHandler.service = service
+    server = ThreadingHTTPServer(('127.0.0.1', port), ServiceRequestHandler)
+
+    print(f"🛰️ 상주 서비스 시작: http://127.0.0.1:{port} (동시 작업 {service.max_workers}개, "
+          f"SAP 세션 {service.sap_pool.size}개)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 상주 서비스를 종료합니다.")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+# CLI 실행 지원
+if __name__ == "__main__":
+    serve(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,219 @@
+# modules/validation.py
+
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append('..')
+from config import 검증_허용오차, 검증_변동임계치
+
+# 항목 구분별 정상 잔액 부호 (잔액 = 차변 - 대변)
+NORMAL_SIGN = {'자산': 1, '비용': 1, '부채': -1, '자본': -1, '수익': -1}
+
+FINDING_COLUMNS = ['회사코드', '결산월', '검증항목', '심각도', '계정과목', '항목', '금액', '내용']
+
+
+def previous_period(period):
+    """직전 결산월 (예: 2025.01 → 2024.12)"""
+    year, month = map(int, period.split('.'))
+    year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return f"{year}.{month:02d}"
+
+
+def statement_lines(statements, company, period):
+    """재무제표(dict) → 항목별 금액 테이블 [회사코드, 결산월, 항목, 금액]"""
+    rows = []
+
+    def flatten_dict(d, parent_key=''):
+        for k, v in d.items():
+            new_key = f"{parent_key}.{k}" if parent_key else k
+            if isinstance(v, dict):
+                flatten_dict(v, new_key)
+            else:
+                rows.append({'회사코드': company, '결산월': period, '항목': new_key, '금액': float(v)})
+
+    for name, statement in statements.items():
+        flatten_dict(statement, name)
+
+    return pd.DataFrame(rows, columns=['회사코드', '결산월', '항목', '금액'])
+
+
+class ValidationReport:
+    """검증 결과 (발견 사항 DataFrame)"""
+
+    def __init__(self, findings):
+        self.findings = findings
+
+    @property
+    def passed(self):
+        """오류(error) 없이 통과했는지 여부"""
+        return not (self.findings['심각도'] == 'error').any()
+
+    def summary(self):
+        """검증항목/심각도별 건수"""
+        if self.findings.empty:
+            return pd.DataFrame(columns=['검증항목', '심각도', '건수'])
+        return self.findings.groupby(['검증항목', '심각도']).size().reset_index(name='건수')
+
+    def to_dict(self):
+        return {
+            'passed': self.passed,
+            'summary': self.summary().to_dict(orient='records'),
+            'findings': self.findings.to_dict(orient='records'),
+        }
+
+    def print_summary(self):
+        """검증 결과 요약 출력"""
+        if self.findings.empty:
+            print("✅ 검증 통과: 발견 사항 없음")
+            return
+
+        status = "✅ 검증 통과" if self.passed else "❌ 검증 실패"
+        print(f"{status}: 발견 사항 {len(self.findings)}건")
+        for _, row in self.summary().iterrows():
+            print(f"   - [{row['심각도']}] {row['검증항목']}: {row['건수']}건")
+
+
+class TrialBalanceValidator:
+    """시산표/재무제표 검증 엔진
+
+    여러 회사/결산월의 시산표를 쌓은 DataFrame
+    [회사코드, 결산월, 계정과목, 차변, 대변]을 한 번에 검증합니다.
+    """
+
+    def __init__(self, chart, tolerance=None, jump_threshold=None):
+        self.chart = chart
+        self.tolerance = 검증_허용오차 if tolerance is None else tolerance
+        self.jump_threshold = 검증_변동임계치 if jump_threshold is None else jump_threshold
+
+    def validate(self, tb, lines=None):
+        """전체 검증 실행
+
+        tb: 시산표 (회사코드/결산월 컬럼 필수)
+        lines: 재무제표 항목 테이블 (statement_lines 형식, 기간 간 변동 검증용)
+        """
+        tb = tb[tb['계정과목'].notna()].copy()
+        tb['계정과목'] = tb['계정과목'].astype(str)
+        tb['잔액'] = tb['차변'] - tb['대변']
+
+        tb = self.chart.classify_trial_balance(tb)
+
+        findings = [
+            self.check_debit_credit(tb),
+            self.check_mapping(tb),
+            self.check_signs(tb),
+            self.check_balance_sheet(tb),
+        ]
+
+        if lines is None:
+            lines = tb[tb['항목'].notna()].groupby(['회사코드', '결산월', '항목'], as_index=False)['잔액'].sum()
+            lines = lines.rename(columns={'잔액': '금액'})
+        else:
+            findings.append(self.check_statement_balance(lines))
+        findings.append(self.check_jumps(lines))
+
+        findings = [f for f in findings if not f.empty]
+        if not findings:
+            return ValidationReport(pd.DataFrame(columns=FINDING_COLUMNS))
+        return ValidationReport(pd.concat(findings, ignore_index=True)[FINDING_COLUMNS])
+
+    def check_debit_credit(self, tb):
+        """차변 합계 = 대변 합계"""
+        totals = tb.groupby(['회사코드', '결산월'], as_index=False)[['차변', '대변']].sum()
+        totals['금액'] = totals['차변'] - totals['대변']
+        bad = totals[totals['금액'].abs() > self.tolerance]
+
+        return bad.assign(
+            검증항목='차대일치', 심각도='error', 계정과목=None, 항목=None,
+            내용=[f"차변 {d:,.0f} ≠ 대변 {c:,.0f}" for d, c in zip(bad['차변'], bad['대변'])]
+        )
+
+    def check_mapping(self, tb):
+        """중복 매핑 (계정과목 기준) / 미매핑 계정 (회사코드, 결산월, 계정과목 기준)"""
+        accounts = tb.groupby('계정과목').agg(
+            항목=('항목', 'first'), 일치수=('일치수', 'max'), 모호=('모호', 'any'),
+            일치항목=('일치항목', 'first'), 금액=('잔액', 'sum'),
+        )
+
+        # 같은 우선순위로 여러 항목에 일치 → 오류, 더 긴 키워드로 결정됨 → 참고
+        multi = accounts[accounts['일치수'] > 1]
+        multi = pd.DataFrame({
+            '계정과목': multi.index, '항목': multi['항목'].to_numpy(), '금액': multi['금액'].to_numpy(),
+            '검증항목': '중복매핑',
+            '심각도': np.where(multi['모호'], 'error', 'info'),
+            '내용': np.where(multi['모호'], '여러 항목에 같은 우선순위로 매핑됨: ', '여러 항목에 일치, 가장 긴 키워드로 분류: ').astype(object)
+                    + multi['일치항목'].to_numpy(),
+        })
+
+        multi = multi.assign(회사코드=None, 결산월=None)
+
+        # 미매핑은 회사/결산월별 잔액으로 판단 (여러 회사/결산월을 쌓은 시산표도 어디서 나왔는지 표시)
+        unmapped = tb[tb['항목'].isna()].groupby(['회사코드', '결산월', '계정과목'], as_index=False)['잔액'].sum()
+        unmapped = unmapped[unmapped['잔액'].abs() > self.tolerance]
+        unmapped = pd.DataFrame({
+            '회사코드': unmapped['회사코드'], '결산월': unmapped['결산월'],
+            '계정과목': unmapped['계정과목'], '항목': None, '금액': unmapped['잔액'],
+            '검증항목': '미매핑', '심각도': 'warning', '내용': '재무제표 항목에 매핑되지 않은 계정',
+        })
+
+        return pd.concat([multi, unmapped], ignore_index=True)
+
+    def check_signs(self, tb):
+        """구분별 정상 잔액 부호와 반대인 계정"""
+        normal = tb['구분'].map(NORMAL_SIGN)
+        bad = tb[(normal * tb['잔액']) < -self.tolerance]
+
+        return pd.DataFrame({
+            '회사코드': bad['회사코드'], '결산월': bad['결산월'],
+            '계정과목': bad['계정과목'], '항목': bad['항목'], '금액': bad['잔액'],
+            '검증항목': '부호이상', '심각도': 'warning',
+            '내용': bad['구분'] + ' 계정의 잔액 부호가 반대',
+        })
+
+    def check_balance_sheet(self, tb):
+        """자산 = 부채 + 자본 (당기 손익 포함, 시산표 분류 기준)"""
+        sections = tb.pivot_table(index=['회사코드', '결산월'], columns='구분', values='잔액',
+                                  aggfunc='sum', fill_value=0)
+        sections = sections.reindex(columns=list(NORMAL_SIGN), fill_value=0)
+
+        totals = pd.DataFrame({
+            '자산': sections['자산'],
+            '부채및자본': -(sections['부채'] + sections['자본'] + sections['수익'] + sections['비용']),
+        })
+        return self._balance_findings(totals)
+
+    def check_statement_balance(self, lines):
+        """자산 = 부채 + 자본 (생성된 재무제표 기준, 미처분 당기순이익 포함)"""
+        item = lines['항목']
+        signed = pd.DataFrame({
+            '회사코드': lines['회사코드'], '결산월': lines['결산월'],
+            '자산': lines['금액'].where(item.str.startswith('재무상태표.자산'), 0),
+            '부채및자본': -lines['금액'].where(item.str.startswith(('재무상태표.부채', '재무상태표.자본')), 0)
+                        + lines['금액'].where(item == '손익계산서.당기순이익', 0),
+        })
+        totals = signed.groupby(['회사코드', '결산월'])[['자산', '부채및자본']].sum()
+        return self._balance_findings(totals)
+
+    def _balance_findings(self, totals):
+        totals = totals.assign(금액=totals['자산'] - totals['부채및자본'])
+        bad = totals[totals['금액'].abs() > self.tolerance].reset_index()
+
+        return bad.assign(
+            검증항목='대차평균', 심각도='error', 계정과목=None, 항목=None,
+            내용=[f"자산 {a:,.0f} ≠ 부채+자본 {c:,.0f}" for a, c in zip(bad['자산'], bad['부채및자본'])]
+        )
+
+    def check_jumps(self, lines):
+        """직전 기간 대비 변동률이 임계치를 넘는 항목"""
+        if lines.empty:
+            return pd.DataFrame(columns=FINDING_COLUMNS)
+
+        lines = lines.sort_values(['회사코드', '항목', '결산월'])
+        previous = lines.groupby(['회사코드', '항목'])['금액'].shift()
+        change = (lines['금액'] - previous) / previous.abs()
+        bad = lines[(previous.abs() > self.tolerance) & (change.abs() > self.jump_threshold)]
+        change = change[bad.index]
+
+        return bad.assign(
+            검증항목='기간변동', 심각도='info', 계정과목=None,
+            내용=[f"직전 기간 대비 {c * 100:+.1f}%" for c in change]
+        )
@@ -0,0 +1,26 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from modules.account_mapping import ChartOfAccounts  # noqa: E402
+
+CHART_FILE = os.path.join(REPO_DIR, 'data', 'mapping', 'chart_of_accounts.json')
+
+
+@pytest.fixture
+def chart():
+    """저장소의 계정 매핑 (키워드 규칙)"""
+    return ChartOfAccounts.load(CHART_FILE)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """임시 작업 폴더 (레이아웃 등록부 등 상대 경로 파일이 저장소에 생기지 않도록)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
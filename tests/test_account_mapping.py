@@ -0,0 +1,127 @@
+# tests/test_account_mapping.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.account_mapping import ChartOfAccounts, load_chart
+
+LINES = [
+    {'section': '자산', 'line': '현금및현금성자산', 'ranges': [[1000, 1099]], 'keywords': ['현금', '보통예금']},
+    {'section': '자산', 'line': '매출채권', 'ranges': [[1100, 1199]], 'keywords': ['매출채권']},
+    {'section': '자산', 'line': '재고자산', 'ranges': [[1200, 1299]], 'keywords': ['상품']},
+    {'section': '자산', 'line': '유형자산', 'ranges': [], 'keywords': ['토지']},
+    {'section': '수익', 'line': '매출액', 'ranges': [[4000, 4999]], 'keywords': ['매출', '상품매출']},
+]
+
+
+def write_chart(path, version, lines=LINES):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'lines': lines}, f, ensure_ascii=False)
+    return str(path)
+
+
+def test_range_boundaries():
+    """범위 시작/끝 계정은 포함, 바로 바깥은 범위 밖"""
+    chart = ChartOfAccounts('t', LINES)
+    numbers = [999, 1000, 1099, 1100, 1199, 1299, 1300, 3999, 4000, 4999, 5000]
+
+    assert chart.classify_numbers(numbers).tolist() == [-1, 0, 0, 1, 1, 2, -1, -1, 4, 4, -1]
+
+
+def test_range_numbers_as_text():
+    """계정번호 문자열/비숫자도 처리 (숫자가 아니면 범위 밖)"""
+    chart = ChartOfAccounts('t', LINES)
+
+    assert chart.classify_numbers(['1000', '4500', 'ABC', None]).tolist() == [0, 4, -1, -1]
+
+
+def test_overlapping_ranges_rejected():
+    lines = LINES + [{'section': '자산', 'line': '기타', 'ranges': [[1090, 1110]]}]
+    with pytest.raises(ValueError, match='계정 범위 중복'):
+        ChartOfAccounts('t', lines)
+
+
+def test_range_takes_priority_over_keywords():
+    """범위에 있는 계정은 이름과 무관하게 범위로 분류"""
+    result = ChartOfAccounts('t', LINES).classify([1100], ['현금'])
+
+    assert result.loc[0, ['항목', '분류방법', '일치수']].tolist() == ['매출채권', '범위', 1]
+
+
+def test_keyword_fallback_longest_keyword():
+    """범위 밖 계정은 키워드로 분류, 여러 항목에 일치하면 가장 긴 키워드"""
+    chart = ChartOfAccounts('t', LINES)
+    result = chart.classify([np.nan, 9000, np.nan, np.nan], ['보통예금', '상품매출', '잡손실', 'CASH'])
+
+    assert result['항목'].tolist() == ['현금및현금성자산', '매출액', None, None]
+    assert result['분류방법'].tolist() == ['키워드', '키워드', None, None]
+    assert result['일치수'].tolist() == [1, 2, 0, 0]
+    assert result['모호'].tolist() == [False, False, False, False]
+    assert result['일치항목'].tolist() == ['현금및현금성자산', '재고자산, 매출액', '', '']
+
+
+def test_keyword_case_insensitive():
+    lines = [{'section': '자산', 'line': '현금및현금성자산', 'ranges': [], 'keywords': ['Cash']}]
+    result = ChartOfAccounts('t', lines).classify(None, ['PETTY CASH', 'cash in bank', 'Deposit'])
+
+    assert result['항목'].tolist() == ['현금및현금성자산', '현금및현금성자산', None]
+
+
+def test_ambiguous_equal_length_keywords():
+    """같은 길이 키워드로 여러 항목에 일치하면 모호 (먼저 정의된 항목 선택)"""
+    result = ChartOfAccounts('t', LINES).classify(None, ['상품토지'])
+
+    assert result.loc[0, ['항목', '일치수', '모호', '일치항목']].tolist() == ['재고자산', 2, True, '재고자산, 유형자산']
+
+
+def test_classify_trial_balance_spreads_unique_pairs():
+    """고유 (계정번호, 계정과목) 조합만 분류해 모든 행에 펼침"""
+    tb = pd.DataFrame({
+        '계정번호': ['1000', '1000', '9000', '9000', None],
+        '계정과목': ['현금', '현금', '토지', '현금', '상품'],
+        '잔액': [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+    result = ChartOfAccounts('t', LINES).classify_trial_balance(tb)
+
+    assert result['항목'].tolist() == ['현금및현금성자산', '현금및현금성자산', '유형자산', '현금및현금성자산', '재고자산']
+    assert result['분류방법'].tolist() == ['범위', '범위', '키워드', '키워드', '키워드']
+    assert result['잔액'].tolist() == tb['잔액'].tolist()
+
+
+def test_classify_trial_balance_number_prefix():
+    """계정번호 컬럼이 없으면 계정과목 앞자리 숫자로 범위 분류"""
+    tb = pd.DataFrame({'계정과목': ['1100 외상매출금', '4000 국내', '기타 토지']})
+    result = ChartOfAccounts('t', LINES).classify_trial_balance(tb)
+
+    assert result['항목'].tolist() == ['매출채권', '매출액', '유형자산']
+
+
+def test_load_chart_cached_until_file_changes(tmp_path):
+    """파일이 바뀌지 않으면 같은 매핑 재사용, 바뀌면 다시 로드 (버전 = version + 내용 해시)"""
+    path = write_chart(tmp_path / 'chart.json', '2025.1')
+
+    first = load_chart(path)
+    assert load_chart(path) is first
+    assert first.version.startswith('2025.1:') and len(first.version) == len('2025.1:') + 8
+
+    # 같은 version 값이라도 내용이 바뀌면 해시가 달라짐
+    write_chart(tmp_path / 'chart.json', '2025.1', LINES[:-1])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = load_chart(path)
+    assert second is not first
+    assert second.version.startswith('2025.1:') and second.version != first.version
+    assert len(second.lines) == len(LINES) - 1
+
+
+def test_same_content_same_version(tmp_path):
+    """같은 내용이면 경로가 달라도 같은 버전 (결과 캐시 키가 유지됨)"""
+    a = ChartOfAccounts.load(write_chart(tmp_path / 'a.json', '2025.1'))
+    b = ChartOfAccounts.load(write_chart(tmp_path / 'b.json', '2025.1'))
+
+    assert a.version == b.version
@@ -0,0 +1,106 @@
+# tests/test_consolidation.py
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from modules.consolidation import Consolidator, normalize_period
+
+# 모회사 P (KRW) ↔ 자회사 S (USD)
+# - 채권채무: P 매출채권 1,300 ↔ S 매입채무 1 USD × 기말 1,300 → 일치
+# - 수익비용: P 매출 1,300 ↔ S 매출원가 1 USD × 평균 1,250 → 차이 -50
+TB = pd.DataFrame([
+    ('P', 2025.05, '현금', 10000, 0, 'KRW', None),
+    ('P', 2025.05, '매출채권', 1300, 0, 'KRW', 'S'),
+    ('P', 2025.05, '자본금', 0, 10000, 'KRW', ''),
+    ('P', 2025.05, '매출', 0, 1300, 'KRW', 'S'),
+    ('S', 2025.05, '현금', 10, 0, 'USD', None),
+    ('S', 2025.05, '매출원가', 1, 0, 'USD', 'P'),
+    ('S', 2025.05, '자본금', 0, 10, 'USD', None),
+    ('S', 2025.05, '매입채무', 0, 1, 'USD', 'P'),
+], columns=['회사코드', '결산월', '계정과목', '차변', '대변', '통화', '거래상대'])
+
+RATES = pd.DataFrame([('USD', '2025.05', 1300.0, 1250.0, 1200.0)],
+                     columns=['통화', '결산월', '기말환율', '평균환율', '역사적환율'])
+
+
+@pytest.fixture
+def result(chart):
+    return Consolidator(chart=chart, reporting_currency='KRW', tolerance=0.5).consolidate(TB, RATES)
+
+
+def amounts(entries, kind):
+    """조정유형별 (회사코드, 계정과목) → 금액"""
+    rows = entries[entries['조정유형'] == kind]
+    return {(c, a): amount for c, a, amount in rows[['회사코드', '계정과목', '금액']].itertuples(index=False)}
+
+
+def test_translation_rates_by_section(result):
+    """자산/부채는 기말, 수익/비용은 평균, 자본은 역사적 환율"""
+    s = result.translated[result.translated['회사코드'] == 'S'].set_index('계정과목')
+
+    assert s['환율'].to_dict() == {'현금': 1300.0, '매출원가': 1250.0, '자본금': 1200.0, '매입채무': 1300.0}
+    assert s['환산잔액'].to_dict() == {'현금': 13000.0, '매출원가': 1250.0, '자본금': -12000.0, '매입채무': -1300.0}
+    assert (result.translated.loc[result.translated['회사코드'] == 'P', '환율'] == 1.0).all()
+    assert set(result.translated['결산월']) == {'2025.05'}
+
+
+def test_intercompany_matching(result):
+    matches = result.matches.set_index('유형')
+
+    assert matches.loc['채권채무', ['회사코드', '거래상대', '채권측금액', '채무측금액', '차이', '상태']].tolist() == \
+        ['P', 'S', 1300.0, -1300.0, 0.0, '일치']
+    assert matches.loc['수익비용', ['회사코드', '거래상대', '채권측금액', '채무측금액', '차이', '상태']].tolist() == \
+        ['P', 'S', -1300.0, 1250.0, -50.0, '차이']
+
+
+def test_elimination_cta_and_difference_entries(result):
+    entries = result.entries
+
+    assert amounts(entries, '내부거래제거(채권채무)') == {('P', '매출채권'): -1300.0, ('S', '매입채무'): 1300.0}
+    assert amounts(entries, '내부거래제거(수익비용)') == {('P', '매출'): 1300.0, ('S', '매출원가'): -1250.0}
+    assert amounts(entries, '내부거래차이(수익비용)') == {('P', '내부거래차이'): -50.0}
+    # S 환산 시산표 합계 950 (자본 역사적환율/손익 평균환율) → 환산차이로 상계
+    assert amounts(entries, '환산차이') == {('S', '해외사업환산손익'): -950.0}
+
+
+def test_consolidated_trial_balance_balances(result):
+    tb = result.period_trial_balance('2025.05').set_index('계정과목')
+
+    assert tb['차변'].sum() == pytest.approx(tb['대변'].sum())
+    assert tb.loc['현금', '차변'] == 23000.0
+    assert tb.loc['자본금', '대변'] == 22000.0
+    assert tb.loc['해외사업환산손익', '대변'] == 950.0
+    assert tb.loc['내부거래차이', '대변'] == 50.0
+    for account in ['매출채권', '매입채무', '매출', '매출원가']:
+        assert tb.loc[account, '차변'] == tb.loc[account, '대변'] == 0.0
+
+
+def test_consolidated_statements_balance(result, chart):
+    """연결 시산표로 만든 재무상태표도 대차평균 (조정 계정이 재무제표 항목에 매핑됨)"""
+    fs = result.to_financial_statements(2025.05, chart=chart)
+    fs.generate_statements()
+    report = fs.validate()
+
+    assert not (report.findings['검증항목'].isin(['대차평균', '미매핑'])).any()
+    assert fs.statements['재무상태표']['자본']['연결조정차이'] == -50.0
+    assert fs.statements['재무상태표']['자본']['기타포괄손익누계액'] == -950.0
+
+
+def test_missing_rate_raises(chart):
+    with pytest.raises(ValueError, match='환율 없음: USD 2025.05'):
+        Consolidator(chart=chart, reporting_currency='KRW').consolidate(TB, RATES.iloc[0:0])
+
+
+@pytest.mark.parametrize('value, expected', [
+    (2025.1, '2025.10'), (2025.05, '2025.05'), (202512, '2025.12'),
+    ('2025-3', '2025.03'), ('2025.05', '2025.05'), (date(2025, 10, 31), '2025.10'),
+])
+def test_normalize_period(value, expected):
+    assert normalize_period(value) == expected
+
+
+def test_normalize_period_rejects_bad_month():
+    with pytest.raises(ValueError):
+        normalize_period('2025.13')
@@ -0,0 +1,109 @@
+# tests/test_result_store.py
+
+import os
+
+import pandas as pd
+
+import main
+import modules.result_store as result_store
+from modules.account_mapping import ChartOfAccounts
+from modules.financial_statements import FinancialStatements
+from modules.result_store import ResultStore
+
+TB_ROWS = [
+    ('1010', '현금', 5000, 0),
+    ('2010', '매입채무', 0, 1000),
+    ('3010', '자본금', 0, 3000),
+    ('4010', '상품매출', 0, 2000),
+    ('5010', '급여', 1000, 0),
+]
+
+
+def write_tb(path, rows=TB_ROWS):
+    pd.DataFrame(rows, columns=['계정번호', '계정과목', '차변', '대변']).to_excel(path, index=False)
+    return str(path)
+
+
+def run_close(store, chart, tb_file, output_file):
+    """시산표 로드 → 재무제표 → 재무비율 → 내보내기"""
+    fs = FinancialStatements('h182', '2025.05', store=store, chart=chart)
+    fs.load_trial_balance(tb_file)
+    fs.generate_statements()
+    fs.calculate_financial_ratios()
+    fs.export_to_excel(str(output_file))
+    return fs
+
+
+def counts(store):
+    return {stage: (c['hit'], c['miss']) for stage, c in store.stats.items()}
+
+
+def test_rerun_hits_cache(workdir, chart):
+    """같은 시산표 해시 + 매핑 버전 재실행: 재무제표/비율/내보내기 모두 캐시 적중"""
+    store = ResultStore(str(workdir / 'store.sqlite'))
+    tb_file = write_tb(workdir / 'tb.xlsx')
+    output_file = workdir / 'out.xlsx'
+
+    first = run_close(store, chart, tb_file, output_file)
+    assert counts(store) == {'statements': (0, 1), 'ratios': (0, 1), 'export': (0, 1)}
+    written = os.path.getmtime(output_file)
+
+    second = run_close(store, chart, tb_file, output_file)
+    assert counts(store) == {'statements': (1, 1), 'ratios': (1, 1), 'export': (1, 1)}
+    assert second.statements == first.statements
+    assert second.ratios == first.ratios
+    assert os.path.getmtime(output_file) == written
+
+
+def test_changed_trial_balance_misses(workdir, chart):
+    """시산표 금액이 바뀌면 캐시 미스 후 다시 내보내기"""
+    store = ResultStore(str(workdir / 'store.sqlite'))
+    output_file = workdir / 'out.xlsx'
+    run_close(store, chart, write_tb(workdir / 'tb.xlsx'), output_file)
+
+    changed = [('1010', '현금', 6000, 0)] + TB_ROWS[1:3] + [('4010', '상품매출', 0, 3000)] + TB_ROWS[4:]
+    fs = run_close(store, chart, write_tb(workdir / 'tb.xlsx', changed), output_file)
+
+    assert counts(store) == {'statements': (0, 2), 'ratios': (0, 2), 'export': (0, 2)}
+    assert fs.statements['재무상태표']['자산']['유동자산']['현금및현금성자산'] == 6000
+
+
+def test_changed_mapping_misses(workdir, chart):
+    """매핑 버전이 바뀌면 같은 시산표라도 캐시 미스"""
+    store = ResultStore(str(workdir / 'store.sqlite'))
+    tb_file = write_tb(workdir / 'tb.xlsx')
+    run_close(store, chart, tb_file, workdir / 'out.xlsx')
+
+    remapped = ChartOfAccounts('2025.2:test', chart.lines)
+    run_close(store, remapped, tb_file, workdir / 'out.xlsx')
+
+    assert counts(store) == {'statements': (0, 2), 'ratios': (0, 2), 'export': (0, 2)}
+
+
+def test_invalidate(workdir, chart):
+    """회사/결산월 조건으로 저장된 결과 삭제 후 재실행은 미스"""
+    store = ResultStore(str(workdir / 'store.sqlite'))
+    tb_file = write_tb(workdir / 'tb.xlsx')
+    run_close(store, chart, tb_file, workdir / 'out.xlsx')
+
+    assert store.invalidate('h999') == 0
+    assert store.invalidate('h182', '2025.05') == 3
+    assert store.latest('h182', '2025.05', 'statements') is None
+
+    run_close(store, chart, tb_file, workdir / 'out.xlsx')
+    assert counts(store)['statements'] == (0, 2)
+
+
+def test_cache_clear_command(workdir, chart, monkeypatch):
+    """main.py cache-clear 회사코드 결산월: 기본 저장소에서 해당 결과만 삭제"""
+    db_path = str(workdir / 'store.sqlite')
+    monkeypatch.setattr(result_store, '결과저장소경로', db_path)
+
+    store = ResultStore()
+    fs = run_close(store, chart, write_tb(workdir / 'tb.xlsx'), workdir / 'out.xlsx')
+    store.put(('h183', '2025.05', 'hash', chart.version), 'statements', {'재무상태표': {}})
+
+    main.run_command(['cache-clear', 'h182', '2025.05'])
+
+    assert store.get(fs.cache_key, 'statements') is None
+    assert store.get(('h183', '2025.05', 'hash', chart.version), 'statements') == {'재무상태표': {}}
@@ -0,0 +1,63 @@
+# tests/test_rolling_workbook.py
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from modules.financial_statements import FinancialStatements
+from modules.rolling_workbook import RollingWorkbook
+
+
+def export_period(workdir, chart, period, cash, sales):
+    """결산월 하나의 시산표로 재무제표를 만들어 누적 통합문서에 내보내기"""
+    tb_file = str(workdir / f"tb_{period}.xlsx")
+    pd.DataFrame({
+        '계정번호': ['1010', '3010', '4010'],
+        '계정과목': ['현금', '자본금', '국내매출'],
+        '차변': [cash, 0, 0],
+        '대변': [0, cash - sales, sales],
+    }).to_excel(tb_file, index=False)
+
+    fs = FinancialStatements('h182', period, chart=chart)
+    fs.load_trial_balance(tb_file)
+    fs.generate_statements()
+    fs.validate()
+    fs.calculate_financial_ratios()
+    return fs.export_incremental(str(workdir / 'rolling.xlsx'))
+
+
+def rows(ws):
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+def test_backfilled_period_inserted_in_order(workdir, chart):
+    """2025.05 이후 2025.04를 내보내도 열/요약 행/검증결과 시트가 결산월 순서"""
+    export_period(workdir, chart, '2025.05', cash=5000, sales=2000)
+    workbook_file = export_period(workdir, chart, '2025.04', cash=3000, sales=1000)
+
+    wb = load_workbook(workbook_file)
+
+    bs = rows(wb['재무상태표'])
+    assert bs[0] == ['항목', '2025.04', '2025.05']
+    cash = next(row for row in bs if row[0].endswith('현금및현금성자산'))
+    assert cash[1:] == [3000, 5000]
+
+    summary = rows(wb['요약'])
+    header = summary[0]
+    assert header[0] == '결산월'
+    assert [row[0] for row in summary[1:]] == ['2025.04', '2025.05']
+    assert [row[header.index('자산총계')] for row in summary[1:]] == [3000, 5000]
+    assert [row[header.index('매출액')] for row in summary[1:]] == [1000, 2000]
+
+    assert [name for name in wb.sheetnames if name.startswith('검증결과_')] == ['검증결과_2025.04', '검증결과_2025.05']
+
+
+def test_rerun_replaces_period_in_place(tmp_path):
+    """같은 결산월 재실행은 열/시트 위치를 유지한 채 값만 교체"""
+    book = RollingWorkbook(str(tmp_path / 'rolling.xlsx'))
+    for period, value in [('2025.03', 3), ('2025.05', 5), ('2025.04', 4), ('2025.04', 40)]:
+        book.upsert_period('재무상태표', period, {'현금': value})
+        book.replace_sheet(f"검증결과_{period}", pd.DataFrame({'값': [value]}))
+
+    assert rows(book.wb['재무상태표']) == [['항목', '2025.03', '2025.04', '2025.05'], ['현금', 3, 40, 5]]
+    assert book.wb.sheetnames == ['재무상태표', '검증결과_2025.03', '검증결과_2025.04', '검증결과_2025.05']
+    assert rows(book.wb['검증결과_2025.04']) == [['값'], [40]]
@@ -0,0 +1,125 @@
+# tests/test_sales_analyzer.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.columnar_store import SheetHandle
+from modules.sales_analyzer import FACT_COLUMNS, FACT_DIMENSIONS, SalesAnalyzer
+
+
+def write_inputs(folder):
+    """3개월 매출 파일 (지점 컬럼 유무, 여러 시트, 빈 값 포함)"""
+    os.makedirs(folder)
+    pd.DataFrame({'지점': ['A', 'B', 'A', 'A'], '매출액': [100, 200, 50, None],
+                  '판관비용': [10, 20, 5, 1]}).to_excel(os.path.join(folder, '매출_2024_12.xlsx'), index=False)
+
+    with pd.ExcelWriter(os.path.join(folder, '매출_2025_01.xlsx')) as writer:
+        pd.DataFrame({'지점': ['A', 'B'], '매출액': [300, 150], '판관비용': [30, 15]}).to_excel(writer, sheet_name='S1', index=False)
+        pd.DataFrame({'지점': ['C'], '매출액': [50]}).to_excel(writer, sheet_name='S2', index=False)
+
+    pd.DataFrame({'매출액': [200, 300]}).to_excel(os.path.join(folder, '매출_2025_02.xlsx'), index=False)
+
+
+@pytest.fixture(params=[False, True], ids=['in_memory', 'out_of_core'])
+def analyzer(request, tmp_path):
+    folder = str(tmp_path / 'input')
+    write_inputs(folder)
+
+    analyzer = SalesAnalyzer(out_of_core=request.param, spill_dir=str(tmp_path / 'spill'), company='h182', period='2025.02')
+    analyzer.collect_excel_files(folder)
+    yield analyzer
+    if analyzer.spill_store is not None:
+        analyzer.spill_store.cleanup()
+
+
+def test_fact_table(analyzer):
+    """팩트 테이블: 차원 컬럼은 category, 빈 값은 제외, 지점 컬럼 없으면 '전체'"""
+    facts = analyzer.facts
+
+    assert list(facts.columns) == FACT_COLUMNS
+    assert all(isinstance(facts[col].dtype, pd.CategoricalDtype) for col in FACT_DIMENSIONS)
+    assert facts['value'].dtype == float
+    assert facts['value'].notna().all()
+    assert set(facts['branch']) == {'A', 'B', 'C', '전체'}
+    assert set(facts['sheet']) == {'Sheet1', 'S1', 'S2'}
+
+
+def test_sheet_storage(analyzer):
+    """시트별 데이터: 대용량 모드는 디스크 핸들, 일반 모드는 DataFrame"""
+    assert sorted(analyzer.data) == [
+        ('2024.12', '매출_2024_12.xlsx', 'Sheet1'),
+        ('2025.01', '매출_2025_01.xlsx', 'S1'),
+        ('2025.01', '매출_2025_01.xlsx', 'S2'),
+        ('2025.02', '매출_2025_02.xlsx', 'Sheet1'),
+    ]
+    sheet = analyzer.data[('2025.01', '매출_2025_01.xlsx', 'S1')]
+    if analyzer.out_of_core:
+        assert isinstance(sheet, SheetHandle) and os.path.isdir(sheet.path)
+        sheet = sheet.read()
+    assert sheet['매출액'].tolist() == [300, 150]
+
+
+def test_aggregate(analyzer):
+    assert analyzer.aggregate('month', measure='매출').to_dict() == {'2024.12': 350.0, '2025.01': 500.0, '2025.02': 500.0}
+    assert analyzer.aggregate('branch', measure='매출').to_dict() == {'A': 450.0, 'B': 350.0, 'C': 50.0, '전체': 500.0}
+    assert analyzer.aggregate(['month', 'measure']).to_dict() == {
+        ('2024.12', '매출'): 350.0, ('2024.12', '비용'): 36.0,
+        ('2025.01', '매출'): 500.0, ('2025.01', '비용'): 45.0,
+        ('2025.02', '매출'): 500.0,
+    }
+
+
+def test_trend_analysis(analyzer):
+    """월별 → 분기 합계, 전월 대비 성장률, 계절 지수 (전체 평균 = 100)"""
+    results = analyzer.analyze_trends()
+
+    assert results['monthly_sales'] == {'2024.12': 350.0, '2025.01': 500.0, '2025.02': 500.0}
+    assert results['quarterly_trends'] == {'2024-Q4': 350.0, '2025-Q1': 1000.0}
+    assert results['growth_rates'] == {'2025.01': 42.86, '2025.02': 0.0}
+    assert results['seasonality'] == {'01': 111.11, '02': 111.11, '12': 77.78}
+    assert results['measure_totals']['2025.01'] == {'매출': 500.0, '비용': 45.0}
+
+
+def test_remove_file(analyzer):
+    """파일 제거: 시트 데이터 삭제 (대용량 모드는 디스크 데이터도 삭제)"""
+    key = ('2025.01', '매출_2025_01.xlsx', 'S1')
+    sheet = analyzer.data[key]
+
+    analyzer.remove_file('매출_2025_01.xlsx')
+
+    assert all(k[1] != '매출_2025_01.xlsx' for k in analyzer.data)
+    if analyzer.out_of_core:
+        assert not os.path.exists(sheet.path)
+
+
+def test_modes_agree(tmp_path):
+    """일반/대용량 모드의 분석 결과가 같음 (대용량 모드는 미리 집계한 팩트 사용)"""
+    folder = str(tmp_path / 'input')
+    write_inputs(folder)
+
+    results = []
+    for out_of_core in (False, True):
+        analyzer = SalesAnalyzer(out_of_core=out_of_core, spill_dir=str(tmp_path / 'spill'))
+        analyzer.collect_excel_files(folder)
+        results.append((len(analyzer.facts), analyzer.analyze_trends()))
+        if analyzer.spill_store is not None:
+            analyzer.spill_store.cleanup()
+
+    (memory_rows, memory), (spilled_rows, spilled) = results
+    assert spilled_rows < memory_rows
+    for key in ['monthly_sales', 'quarterly_trends', 'growth_rates', 'seasonality', 'branch_sales', 'measure_totals']:
+        assert spilled[key] == memory[key]
+
+
+def test_empty_fact_table():
+    analyzer = SalesAnalyzer()
+    facts = analyzer.build_fact_table([pd.DataFrame(columns=FACT_COLUMNS)])
+
+    assert facts.empty and list(facts.columns) == FACT_COLUMNS
+    assert analyzer.calculate_growth_rates({}) == {}
+    assert analyzer.analyze_seasonality({}) == {}
+    assert analyzer.calculate_growth_rates({'2025.01': 0.0, '2025.02': 10.0}) == {}
+    assert np.isclose(analyzer.calculate_growth_rates({'2025.01': 10.0, '2025.02': 5.0})['2025.02'], -50.0)
@@ -0,0 +1,37 @@
+# tests/test_sap_script.py
+
+import os
+
+from modules.sap_script import FakeSession, load_script
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'scripts', 'trial_balance.json')
+
+COMPANY_FIELD = 'wnd[0]/usr/ctrlCOMPANY_CODE/txtS_BUKRS-LOW'
+YEAR_FIELD = 'wnd[0]/usr/ctrlFISCAL_YEAR/txtS_GJAHR-LOW'
+MONTH_FIELD = 'wnd[0]/usr/ctrlPERIOD/txtS_MONAT-LOW'
+PATH_FIELD = 'wnd[1]/usr/ctrlSSLN_EXPORT/txtDY_PATH'
+EXPORT_BUTTON = 'wnd[1]/tbar[0]/btn[11]'
+
+
+def test_trial_balance_replay_calls():
+    """F.01 시산표 추출 스크립트: FakeSession에서 COM 호출 순서/횟수 확인"""
+    session = FakeSession()
+    result = load_script(SCRIPT_PATH).replay(session, company='h182', year='2025', month='05',
+                                             path='C:\\SAP\\시산표_h182_2025.05.xlsx')
+
+    assert session.calls == [
+        ('StartTransaction', 'F.01'),
+        ('findById', COMPANY_FIELD), ('set', COMPANY_FIELD, 'text', 'h182'),
+        ('findById', YEAR_FIELD), ('set', YEAR_FIELD, 'text', '2025'),
+        ('findById', MONTH_FIELD), ('set', MONTH_FIELD, 'text', '05'),
+        ('findById', 'wnd[0]'), ('sendVKey', 'wnd[0]', 8),
+        ('findById', 'wnd[0]'), ('sendVKey', 'wnd[0]', 45),
+        ('findById', PATH_FIELD), ('set', PATH_FIELD, 'text', 'C:\\SAP\\시산표_h182_2025.05.xlsx'),
+        ('findById', EXPORT_BUTTON), ('press', EXPORT_BUTTON),
+    ]
+
+    # okcode 입력 + Enter 대신 StartTransaction 한 번 (기존 17회 → 15회)
+    assert result['com_calls'] == len(session.calls) == 15
+    assert [(label, calls) for label, _, calls in result['steps']] == [
+        ('tcode', 1), ('set', 6), ('execute', 2), ('export', 6),
+    ]
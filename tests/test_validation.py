@@ -0,0 +1,111 @@
+# tests/test_validation.py
+
+import pandas as pd
+
+from modules.validation import TrialBalanceValidator, previous_period
+
+
+def make_tb(rows):
+    """[(회사코드, 결산월, 계정과목, 차변, 대변), ...] → 시산표"""
+    return pd.DataFrame(rows, columns=['회사코드', '결산월', '계정과목', '차변', '대변'])
+
+
+def balanced(company, period, cash=5000):
+    return [
+        (company, period, '현금', cash, 0),
+        (company, period, '자본금', 0, cash - 2000),
+        (company, period, '국내매출', 0, 2000),
+    ]
+
+
+def findings_of(report, check):
+    return report.findings[report.findings['검증항목'] == check].reset_index(drop=True)
+
+
+def test_balanced_trial_balance_passes(chart):
+    """차대일치/대차평균이 맞고 모두 매핑된 시산표: 발견 사항 없음"""
+    report = TrialBalanceValidator(chart).validate(make_tb(balanced('h1', '2025.05')))
+
+    assert report.passed
+    assert report.findings.empty
+
+
+def test_debit_credit_mismatch_per_company(chart):
+    """여러 회사를 쌓은 시산표에서 차대가 안 맞는 회사만 오류"""
+    tb = make_tb(balanced('h1', '2025.05') + balanced('h2', '2025.05') + [('h2', '2025.05', '현금', 100, 0)])
+    report = TrialBalanceValidator(chart).validate(tb)
+
+    mismatch = findings_of(report, '차대일치')
+    assert not report.passed
+    assert mismatch[['회사코드', '결산월', '금액', '심각도']].values.tolist() == [['h2', '2025.05', 100, 'error']]
+    assert mismatch.loc[0, '내용'] == "차변 5,100 ≠ 대변 5,000"
+
+
+def test_balance_sheet_imbalance(chart):
+    """자산 ≠ 부채 + 자본 (당기 손익 포함)"""
+    tb = make_tb(balanced('h1', '2025.05') + [('h1', '2025.05', '현금', 300, 0)])
+    imbalance = findings_of(TrialBalanceValidator(chart).validate(tb), '대차평균')
+
+    assert imbalance[['회사코드', '결산월', '금액']].values.tolist() == [['h1', '2025.05', 300]]
+    assert imbalance.loc[0, '내용'] == "자산 5,300 ≠ 부채+자본 5,000"
+
+
+def test_unmapped_grouped_by_company_and_period(chart):
+    """미매핑 계정은 회사코드/결산월별로 보고 (잔액 0이면 제외)"""
+    tb = make_tb(
+        balanced('h1', '2025.04') + balanced('h1', '2025.05') + balanced('h2', '2025.05')
+        + [('h1', '2025.05', '가수금', 0, 40), ('h2', '2025.05', '가수금', 70, 0),
+           ('h1', '2025.04', '가수금', 10, 10)]
+    )
+    unmapped = findings_of(TrialBalanceValidator(chart).validate(tb), '미매핑')
+
+    assert unmapped[['회사코드', '결산월', '계정과목', '금액']].values.tolist() == [
+        ['h1', '2025.05', '가수금', -40],
+        ['h2', '2025.05', '가수금', 70],
+    ]
+    assert (unmapped['심각도'] == 'warning').all()
+
+
+def test_duplicate_mapping(chart):
+    """여러 항목에 일치: 더 긴 키워드로 결정되면 info, 같은 길이로 겹치면 error"""
+    tb = make_tb([
+        ('h1', '2025.05', '상품매출', 0, 100),
+        ('h1', '2025.05', '상품토지', 100, 0),
+    ])
+    duplicate = findings_of(TrialBalanceValidator(chart).validate(tb), '중복매핑').set_index('계정과목')
+
+    assert duplicate.loc['상품매출', '심각도'] == 'info'
+    assert duplicate.loc['상품매출', '항목'] == '매출액'
+    assert duplicate.loc['상품토지', '심각도'] == 'error'
+    assert duplicate.loc['상품토지', '내용'] == '여러 항목에 같은 우선순위로 매핑됨: 재고자산, 유형자산'
+
+
+def test_sign_anomaly(chart):
+    """자산 계정이 대변 잔액이면 부호이상"""
+    tb = make_tb(balanced('h1', '2025.05') + [('h1', '2025.05', '보통예금', 0, 50), ('h1', '2025.05', '자본금', 50, 0)])
+    signs = findings_of(TrialBalanceValidator(chart).validate(tb), '부호이상')
+
+    assert signs[['계정과목', '항목', '금액']].values.tolist() == [
+        ['보통예금', '현금및현금성자산', -50],
+        ['자본금', '자본금', 50],
+    ]
+
+
+def test_period_jumps():
+    """직전 기간 대비 변동률이 임계치를 넘는 항목만 보고"""
+    lines = pd.DataFrame({
+        '회사코드': ['h1'] * 4,
+        '결산월': ['2025.04', '2025.05', '2025.04', '2025.05'],
+        '항목': ['매출액', '매출액', '급여', '급여'],
+        '금액': [100.0, 250.0, 100.0, 120.0],
+    })
+    jumps = TrialBalanceValidator(chart=None, jump_threshold=0.5).check_jumps(lines)
+
+    assert jumps[['결산월', '항목', '금액', '내용']].values.tolist() == [
+        ['2025.05', '매출액', 250.0, '직전 기간 대비 +150.0%'],
+    ]
+
+
+def test_previous_period():
+    assert previous_period('2025.05') == '2025.04'
+    assert previous_period('2025.01') == '2024.12'